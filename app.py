@@ -1,8 +1,19 @@
 import streamlit as st
-import pandas as pd
-import joblib
-import plotly.graph_objects as go
+import functools
+import json
 import os
+import tempfile
+import threading
+
+from batch_scoring import DEFAULT_CHUNKSIZE, score_csv
+from explanations import DEFAULT_TOP_K, top_contributions
+from feature_pipeline import RAW_COLUMNS
+from metrics import REGISTRY, start_http_server
+from model_registry import ModelRegistry, load_bundle
+from option_catalog import (APPLICATION_MODE, ATTENDANCE, BOOLEAN, COURSE, GENDER, MARITAL_STATUS, NATIONALITY,
+                            PARENT_OCCUPATION, PARENT_QUALIFICATION, PREVIOUS_QUALIFICATION)
+from prediction_cache import PredictionCache
+from what_if import MAX_STEPS, feature_domains, sweep, sweep_values
 
 # Set page config - must be first Streamlit command
 st.set_page_config(
@@ -11,8 +22,8 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS (string konstanta; Streamlit tetap mengirim ulang elemen ini setiap rerun)
+CUSTOM_CSS = """
     <style>
     .main { 
         padding: 2rem; 
@@ -37,37 +48,131 @@ st.markdown("""
         border: 2px solid #66bb6a;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+# Registry versi model: artefak baru dimuat dan divalidasi di thread latar lalu ditukar
+# secara atomik, tanpa restart server dan tanpa mengganggu sesi yang sedang berjalan
+# Varian ringkas dari model_compaction.py hanya dipakai jika COMPACT_ACCURACY_TOLERANCE diisi
+# (mis. 0.01) dan akurasi hold-out-nya turun paling banyak sebesar nilai tersebut
+COMPACT_ACCURACY_TOLERANCE = os.environ.get('COMPACT_ACCURACY_TOLERANCE')
 
-# Load models with debug info
 @st.cache_resource
-def load_models():
-    try:
-        # Add file existence check
-        model_path = 'model_dropout_xgboost.pkl'
-        scaler_path = 'scaler.pkl'
-        encoders_path = 'label_encoders.pkl'
-        
-        if not all(map(os.path.exists, [model_path, scaler_path, encoders_path])):
-            _ = [f for f in [model_path, scaler_path, encoders_path] if not os.path.exists(f)]
-            return None, None, None
-            
-        # Load model with debug info
-        model = joblib.load(model_path)
-        
-        # Load scaler with debug info
-        scaler = joblib.load(scaler_path)
-        
-        # Load encoders with detailed debug info
-        label_encoders = joblib.load(encoders_path)
-        if not label_encoders:
-            return None, None, None
-        
-        return model, scaler, label_encoders
-    except Exception as e:
-        return None, None, None
+def get_model_registry():
+    tolerance = float(COMPACT_ACCURACY_TOLERANCE) if COMPACT_ACCURACY_TOLERANCE else None
+    return ModelRegistry(loader=functools.partial(load_bundle, compact_tolerance=tolerance)).start()
+
+# Dibagikan ke semua sesi server
+@st.cache_resource
+def get_prediction_cache():
+    cache = PredictionCache()
+    REGISTRY.register_collector(lambda: {f'prediction_cache_{k}': v for k, v in cache.stats().items()})
+    return cache
 
-model, scaler, label_encoders = load_models()
+# Ekspor metrik Prometheus opsional: METRICS_PORT untuk endpoint /metrics, METRICS_FILE untuk file teks
+METRICS_FILE = os.environ.get('METRICS_FILE')
+# Snapshot drift JSON opsional, diperbarui setiap prediksi
+DRIFT_FILE = os.environ.get('DRIFT_FILE')
+
+@st.cache_resource
+def start_metrics_exporter():
+    port = os.environ.get('METRICS_PORT')
+    return start_http_server(int(port)) if port else None
+
+def build_gauge(probability, prediction):
+    import plotly.graph_objects as go
+
+    return go.Figure(go.Indicator(
+        mode = "gauge+number",
+        value = probability * 100,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': "Risiko Dropout (%)"},
+        gauge = {
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "darkred" if prediction == 1 else "green"},
+            'steps': [
+                {'range': [0, 30], 'color': "lightgreen"},
+                {'range': [30, 70], 'color': "yellow"},
+                {'range': [70, 100], 'color': "salmon"}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': 70
+            }
+        }
+    ))
+
+# Template gauge dibangun sekali per proses; setiap render hanya menambal nilai dan warna bar.
+# Lock menjaga agar sesi lain tidak menambal template di antara patch dan serialisasi.
+@st.cache_resource
+def gauge_template():
+    return build_gauge(0.0, 0), threading.Lock()
+
+def render_gauge(probability, prediction):
+    fig, lock = gauge_template()
+    with lock:
+        indicator = fig.data[0]
+        indicator.value = probability * 100
+        indicator.gauge.bar.color = "darkred" if prediction == 1 else "green"
+        st.plotly_chart(fig)
+
+# Rentang valid fitur untuk panel what-if, dari cache dataset kolumnar. Baru dimuat saat sapuan
+# pertama dijalankan agar render awal tidak mengimpor pandas maupun membaca data.csv
+@st.cache_resource
+def load_feature_domains():
+    from dataset_cache import load_dataset
+
+    return feature_domains(load_dataset())
+
+def build_contribution_figure(top, cohort_mean):
+    import plotly.graph_objects as go
+
+    names = [name for name, _ in reversed(top)]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=names, x=[value for _, value in reversed(top)], orientation="h", name="Mahasiswa ini",
+        marker_color=["salmon" if value > 0 else "lightgreen" for _, value in reversed(top)]
+    ))
+    if cohort_mean is not None:
+        fig.add_trace(go.Bar(
+            y=names, x=[cohort_mean[name] for name in names], orientation="h", name="Rata-rata kohort",
+            marker_color="lightgray"
+        ))
+    fig.update_layout(barmode="group", xaxis_title="Kontribusi terhadap risiko (log-odds)")
+    return fig
+
+def build_sweep_figure(columns, values, risk, record):
+    import plotly.graph_objects as go
+
+    if len(columns) == 1:
+        fig = go.Figure(go.Scatter(x=values[0], y=risk * 100, mode="lines+markers", name="Risiko"))
+        fig.add_hline(y=50, line_dash="dash", line_color="red")
+        fig.add_vline(x=record[columns[0]], line_dash="dot", line_color="gray")
+        fig.update_layout(xaxis_title=columns[0], yaxis_title="Risiko Dropout (%)", yaxis_range=[0, 100])
+        return fig
+    fig = go.Figure(go.Heatmap(
+        z=risk.T * 100, x=values[0], y=values[1],
+        zmin=0, zmax=100, colorscale="RdYlGn_r", colorbar={'title': "Risiko (%)"}
+    ))
+    fig.add_trace(go.Scatter(
+        x=[record[columns[0]]], y=[record[columns[1]]], mode="markers",
+        marker={'symbol': "x", 'size': 12, 'color': "black"}, name="Input saat ini"
+    ))
+    fig.update_layout(xaxis_title=columns[0], yaxis_title=columns[1])
+    return fig
+
+model_registry = get_model_registry()
+# Satu bundle dipegang sepanjang rerun ini; hot-swap hanya berlaku untuk rerun berikutnya
+bundle = model_registry.current()
+if bundle is not None:
+    predictor, pipeline = bundle.predictor, bundle.pipeline
+    # Monitor drift input per versi model, dibuat registry dari drift_reference.json (None jika belum ada)
+    drift_monitor = bundle.drift_monitor
+else:
+    predictor = pipeline = drift_monitor = None
+prediction_cache = get_prediction_cache()
+start_metrics_exporter()
 
 # Title
 st.title("🎓 Prediksi Dropout Mahasiswa")
@@ -81,92 +186,27 @@ with st.form("prediction_form"):
 
     # Kelompok 1: Informasi Dasar Mahasiswa
     with st.expander("📋 Informasi Dasar Mahasiswa"):
-        marital_status_mapping = {
-            "1 - Single": 1,
-            "2 - Married": 2,
-            "3 - Widower": 3,
-            "4 - Divorced": 4,
-            "5 - Facto union": 5,
-            "6 - Legally separated": 6,
-        }
-        marital_status = st.selectbox("Status Pernikahan", options=list(marital_status_mapping.keys()))
-        marital_status = marital_status_mapping[marital_status]
-
-        application_mode_mapping = {
-            "1 - 1st phase - general contingent": 1,
-            "2 - Ordinance No. 612/93": 2,
-            "5 - 1st phase - special contingent (Azores Island)": 5,
-            "7 - Holders of other higher courses": 7,
-            "10 - Ordinance No. 854-B/99": 10,
-            "15 - International student (bachelor)": 15,
-            "16 - 1st phase - special contingent (Madeira Island)": 16,
-            "17 - 2nd phase - general contingent": 17,
-            "18 - 3rd phase - general contingent": 18,
-            "26 - Ordinance No. 533-A/99, item b2)": 26,
-            "27 - Ordinance No. 533-A/99, item b3": 27,
-            "39 - Over 23 years old": 39,
-            "42 - Transfer": 42,
-            "43 - Change of course": 43,
-            "44 - Technological specialization diploma holders": 44,
-            "51 - Change of institution/course": 51,
-            "53 - Short cycle diploma holders": 53,
-            "57 - Change of institution/course (International)": 57,
-        }
-        application_mode = st.selectbox("Mode Pendaftaran", options=list(application_mode_mapping.keys()))
-        application_mode = application_mode_mapping[application_mode]
+        marital_status = st.selectbox("Status Pernikahan", options=list(MARITAL_STATUS))
+        marital_status = MARITAL_STATUS[marital_status]
+
+        application_mode = st.selectbox("Mode Pendaftaran", options=list(APPLICATION_MODE))
+        application_mode = APPLICATION_MODE[application_mode]
 
         application_order = st.number_input("Urutan Pendaftaran", min_value=0, max_value=9, value=0)
 
-        course_mapping = {
-            "33 - Biofuel Production Technologies": 33,
-            "171 - Animation and Multimedia Design": 171,
-            "8014 - Social Service (evening attendance)": 8014,
-            "9003 - Agronomy": 9003,
-            "9070 - Communication Design": 9070,
-            "9085 - Veterinary Nursing": 9085,
-            "9119 - Informatics Engineering": 9119,
-            "9130 - Equinculture": 9130,
-            "9147 - Management": 9147,
-            "9238 - Social Service": 9238,
-            "9254 - Tourism": 9254,
-            "9500 - Nursing": 9500,
-            "9556 - Oral Hygiene": 9556,
-            "9670 - Advertising and Marketing Management": 9670,
-            "9773 - Journalism and Communication": 9773,
-            "9853 - Basic Education": 9853,
-            "9991 - Management (evening attendance)": 9991,
-        }
-        course = st.selectbox("Program Studi", options=list(course_mapping.keys()))
-        course = course_mapping[course]
+        course = st.selectbox("Program Studi", options=list(COURSE))
+        course = COURSE[course]
 
-        daytime_evening_attendance = st.selectbox("Waktu Kehadiran", options={"1 - Daytime": 1, "0 - Evening": 0})
+        daytime_evening_attendance = st.selectbox("Waktu Kehadiran", options=list(ATTENDANCE))
+        daytime_evening_attendance = ATTENDANCE[daytime_evening_attendance]
 
     # Kelompok 2: Kualifikasi dan Latar Belakang
     with st.expander("🎓 Kualifikasi dan Latar Belakang"):
-        previous_qualification_mapping = {
-            "1 - Secondary education": 1,
-            "2 - Higher education - bachelor's degree": 2,
-            "3 - Higher education - degree": 3,
-            "4 - Higher education - master's": 4,
-            "5 - Higher education - doctorate": 5,
-            "6 - Frequency of higher education": 6,
-            "9 - 12th year of schooling - not completed": 9,
-            "10 - 11th year of schooling - not completed": 10,
-            "12 - Other - 11th year of schooling": 12,
-            "14 - 10th year of schooling": 14,
-            "15 - 10th year of schooling - not completed": 15,
-            "19 - Basic education 3rd cycle": 19,
-            "38 - Basic education 2nd cycle": 38,
-            "39 - Technological specialization course": 39,
-            "40 - Higher education - degree (1st cycle)": 40,
-            "42 - Professional higher technical course": 42,
-            "43 - Higher education - master (2nd cycle)": 43,
-        }
         previous_qualification = st.selectbox(
             "Kualifikasi Sebelumnya", 
-            options=list(previous_qualification_mapping.keys())
+            options=list(PREVIOUS_QUALIFICATION)
         )
-        previous_qualification = previous_qualification_mapping[previous_qualification]
+        previous_qualification = PREVIOUS_QUALIFICATION[previous_qualification]
 
         previous_qualification_grade = st.number_input(
             "Nilai Kualifikasi Sebelumnya", 
@@ -175,109 +215,20 @@ with st.form("prediction_form"):
             value=100.0
         )
 
-        nationality_mapping = {
-            "1 - Portuguese": 1,
-            "2 - German": 2,
-            "6 - Spanish": 6,
-            "11 - Italian": 11,
-            "13 - Dutch": 13,
-            "14 - English": 14,
-            "17 - Lithuanian": 17,
-            "21 - Angolan": 21,
-            "22 - Cape Verdean": 22,
-            "24 - Guinean": 24,
-            "25 - Mozambican": 25,
-            "26 - Santomean": 26,
-            "32 - Turkish": 32,
-            "41 - Brazilian": 41,
-            "62 - Romanian": 62,
-            "100 - Moldova (Republic of)": 100,
-            "101 - Mexican": 101,
-            "103 - Ukrainian": 103,
-            "105 - Russian": 105,
-            "108 - Cuban": 108,
-            "109 - Colombian": 109,
-        }
-        nationality = st.selectbox("Kewarganegaraan", options=list(nationality_mapping.keys()))
-        nationality = nationality_mapping[nationality]
-
-        mothers_qualification_mapping = {
-            "1 - Secondary Education": 1,
-            "2 - Higher Education - Bachelor's Degree": 2,
-            "3 - Higher Education - Degree": 3,
-            "4 - Higher Education - Master's": 4,
-            "5 - Higher Education - Doctorate": 5,
-            "6 - Frequency of Higher Education": 6,
-            "9 - 12th Year of Schooling - Not Completed": 9,
-            "10 - 11th Year of Schooling - Not Completed": 10,
-            "12 - Other - 11th Year of Schooling": 12,
-            "14 - 10th Year of Schooling": 14,
-            "15 - 10th Year of Schooling - Not Completed": 15,
-            "19 - Basic Education 3rd Cycle": 19,
-            "38 - Basic Education 2nd Cycle": 38,
-            "39 - Technological Specialization Course": 39,
-            "40 - Higher Education - Degree (1st Cycle)": 40,
-            "42 - Professional Higher Technical Course": 42,
-            "43 - Higher Education - Master (2nd Cycle)": 43,
-        }
-        mothers_qualification = st.selectbox("Kualifikasi Ibu", options=list(mothers_qualification_mapping.keys()))
-        mothers_qualification = mothers_qualification_mapping[mothers_qualification]
-
-        fathers_qualification_mapping = {
-            "1 - Secondary Education": 1,
-            "2 - Higher Education - Bachelor's Degree": 2,
-            "3 - Higher Education - Degree": 3,
-            "4 - Higher Education - Master's": 4,
-            "5 - Higher Education - Doctorate": 5,
-            "6 - Frequency of Higher Education": 6,
-            "9 - 12th Year of Schooling - Not Completed": 9,
-            "10 - 11th Year of Schooling - Not Completed": 10,
-            "12 - Other - 11th Year of Schooling": 12,
-            "14 - 10th Year of Schooling": 14,
-            "15 - 10th Year of Schooling - Not Completed": 15,
-            "19 - Basic Education 3rd Cycle": 19,
-            "38 - Basic Education 2nd Cycle": 38,
-            "39 - Technological Specialization Course": 39,
-            "40 - Higher Education - Degree (1st Cycle)": 40,
-            "42 - Professional Higher Technical Course": 42,
-            "43 - Higher Education - Master (2nd Cycle)": 43,
-        }
-        fathers_qualification = st.selectbox("Kualifikasi Ayah", options=list(fathers_qualification_mapping.keys()))
-        fathers_qualification = fathers_qualification_mapping[fathers_qualification]
-
-        mothers_occupation_mapping = {
-            "0 - Not Available": 0,
-            "1 - Executives and Managers": 1,
-            "2 - Professionals": 2,
-            "3 - Technicians and Associate Professionals": 3,
-            "4 - Administrative Staff": 4,
-            "5 - Personal Services, Protection, Security": 5,
-            "6 - Sellers": 6,
-            "7 - Farmers and Skilled Workers in Agriculture": 7,
-            "8 - Skilled Workers in Industry, Construction, Artisans": 8,
-            "9 - Machine Operators and Assembly Workers": 9,
-            "10 - Unskilled Workers": 10,
-            "90 - Other Situation": 90,
-        }
-        mothers_occupation = st.selectbox("Pekerjaan Ibu", options=list(mothers_occupation_mapping.keys()))
-        mothers_occupation = mothers_occupation_mapping[mothers_occupation]
-
-        fathers_occupation_mapping = {
-            "0 - Not Available": 0,
-            "1 - Executives and Managers": 1,
-            "2 - Professionals": 2,
-            "3 - Technicians and Associate Professionals": 3,
-            "4 - Administrative Staff": 4,
-            "5 - Personal Services, Protection, Security": 5,
-            "6 - Sellers": 6,
-            "7 - Farmers and Skilled Workers in Agriculture": 7,
-            "8 - Skilled Workers in Industry, Construction, Artisans": 8,
-            "9 - Machine Operators and Assembly Workers": 9,
-            "10 - Unskilled Workers": 10,
-            "90 - Other Situation": 90,
-        }
-        fathers_occupation = st.selectbox("Pekerjaan Ayah", options=list(fathers_occupation_mapping.keys()))
-        fathers_occupation = fathers_occupation_mapping[fathers_occupation]
+        nationality = st.selectbox("Kewarganegaraan", options=list(NATIONALITY))
+        nationality = NATIONALITY[nationality]
+
+        mothers_qualification = st.selectbox("Kualifikasi Ibu", options=list(PARENT_QUALIFICATION))
+        mothers_qualification = PARENT_QUALIFICATION[mothers_qualification]
+
+        fathers_qualification = st.selectbox("Kualifikasi Ayah", options=list(PARENT_QUALIFICATION))
+        fathers_qualification = PARENT_QUALIFICATION[fathers_qualification]
+
+        mothers_occupation = st.selectbox("Pekerjaan Ibu", options=list(PARENT_OCCUPATION))
+        mothers_occupation = PARENT_OCCUPATION[mothers_occupation]
+
+        fathers_occupation = st.selectbox("Pekerjaan Ayah", options=list(PARENT_OCCUPATION))
+        fathers_occupation = PARENT_OCCUPATION[fathers_occupation]
 
     # Kelompok 3: Informasi Akademik
     with st.expander("📚 Informasi Akademik"):
@@ -299,34 +250,26 @@ with st.form("prediction_form"):
 
     # Kelompok 4: Informasi Ekonomi dan Sosial
     with st.expander("💼 Informasi Ekonomi dan Sosial"):
-        boolean_mapping = {
-            "Tidak": 0,
-            "Ya": 1
-        }
-        displaced = st.selectbox("Apakah Mahasiswa Terdampak (Displaced)?", options=list(boolean_mapping.keys()))
-        displaced = boolean_mapping[displaced]
+        displaced = st.selectbox("Apakah Mahasiswa Terdampak (Displaced)?", options=list(BOOLEAN))
+        displaced = BOOLEAN[displaced]
 
-        educational_special_needs = st.selectbox("Kebutuhan Khusus Pendidikan?", options=list(boolean_mapping.keys()))
-        educational_special_needs = boolean_mapping[educational_special_needs]
+        educational_special_needs = st.selectbox("Kebutuhan Khusus Pendidikan?", options=list(BOOLEAN))
+        educational_special_needs = BOOLEAN[educational_special_needs]
 
-        debtor = st.selectbox("Memiliki Tunggakan?", options=list(boolean_mapping.keys()))
-        debtor = boolean_mapping[debtor]
+        debtor = st.selectbox("Memiliki Tunggakan?", options=list(BOOLEAN))
+        debtor = BOOLEAN[debtor]
 
-        tuition_fees_up_to_date = st.selectbox("Biaya Kuliah Terbayar Tepat Waktu?", options=list(boolean_mapping.keys()))
-        tuition_fees_up_to_date = boolean_mapping[tuition_fees_up_to_date]
+        tuition_fees_up_to_date = st.selectbox("Biaya Kuliah Terbayar Tepat Waktu?", options=list(BOOLEAN))
+        tuition_fees_up_to_date = BOOLEAN[tuition_fees_up_to_date]
 
-        gender_mapping = {
-            "Laki-laki": 1,
-            "Perempuan": 0
-        }
-        gender = st.selectbox("Jenis Kelamin", options=list(gender_mapping.keys()))
-        gender = gender_mapping[gender]
+        gender = st.selectbox("Jenis Kelamin", options=list(GENDER))
+        gender = GENDER[gender]
 
-        scholarship_holder = st.selectbox("Penerima Beasiswa?", options=list(boolean_mapping.keys()))
-        scholarship_holder = boolean_mapping[scholarship_holder]
+        scholarship_holder = st.selectbox("Penerima Beasiswa?", options=list(BOOLEAN))
+        scholarship_holder = BOOLEAN[scholarship_holder]
 
-        international = st.selectbox("Mahasiswa Internasional?", options=list(boolean_mapping.keys()))
-        international = boolean_mapping[international]
+        international = st.selectbox("Mahasiswa Internasional?", options=list(BOOLEAN))
+        international = BOOLEAN[international]
 
         age_at_enrollment = st.number_input("Usia Saat Pendaftaran", min_value=15, max_value=100, value=18)
 
@@ -339,75 +282,112 @@ with st.form("prediction_form"):
     # Tombol submit
     submitted = st.form_submit_button("🔍 Prediksi")
 
+# Buat record input (tanpa DataFrame) dari nilai form terakhir; dipakai juga oleh panel what-if
+with REGISTRY.time('build_input'):
+    input_record = {
+        'Marital_status': marital_status,
+        'Application_mode': application_mode,
+        'Application_order': application_order,
+        'Course': course,
+        'Daytime_evening_attendance': daytime_evening_attendance,
+        'Previous_qualification': previous_qualification,
+        'Previous_qualification_grade': previous_qualification_grade,
+        'Nacionality': nationality,
+        'Mothers_qualification': mothers_qualification,
+        'Fathers_qualification': fathers_qualification,
+        'Mothers_occupation': mothers_occupation,
+        'Fathers_occupation': fathers_occupation,
+        'Admission_grade': admission_grade,
+        'Displaced': displaced,
+        'Educational_special_needs': educational_special_needs,
+        'Debtor': debtor,
+        'Tuition_fees_up_to_date': tuition_fees_up_to_date,
+        'Gender': gender,
+        'Scholarship_holder': scholarship_holder,
+        'Age_at_enrollment': age_at_enrollment,
+        'International': international,
+        'Curricular_units_1st_sem_credited': curricular_units_1st_sem_credited,
+        'Curricular_units_1st_sem_enrolled': curricular_units_1st_sem_enrolled,
+        'Curricular_units_1st_sem_evaluations': curricular_units_1st_sem_evaluations,
+        'Curricular_units_1st_sem_approved': curricular_units_1st_sem_approved,
+        'Curricular_units_1st_sem_grade': curricular_units_1st_sem_grade,
+        'Curricular_units_1st_sem_without_evaluations': curricular_units_1st_sem_without_evaluations,
+        'Curricular_units_2nd_sem_credited': curricular_units_2nd_sem_credited,
+        'Curricular_units_2nd_sem_enrolled': curricular_units_2nd_sem_enrolled,
+        'Curricular_units_2nd_sem_evaluations': curricular_units_2nd_sem_evaluations,
+        'Curricular_units_2nd_sem_approved': curricular_units_2nd_sem_approved,
+        'Curricular_units_2nd_sem_grade': curricular_units_2nd_sem_grade,
+        'Curricular_units_2nd_sem_without_evaluations': curricular_units_2nd_sem_without_evaluations,
+        'GDP': gdp,
+        'Inflation_rate': inflation_rate,
+        'Unemployment_rate': unemployment_rate
+    }
+
 # Update the input data creation to use the numeric values directly
-if submitted and model and scaler and label_encoders:
+if submitted and bundle is not None:
+    REGISTRY.inc('prediction_requests_total')
     try:
-        # Buat DataFrame input
-        input_data = pd.DataFrame({
-            'Marital_status': [marital_status],
-            'Application_mode': [application_mode],
-            'Application_order': [application_order],
-            'Course': [course],
-            'Daytime_evening_attendance': [1],
-            'Previous_qualification': [previous_qualification],
-            'Previous_qualification_grade': [previous_qualification_grade],
-            'Nacionality': [nationality],
-            'Mothers_qualification': [mothers_qualification],
-            'Fathers_qualification': [fathers_qualification],
-            'Mothers_occupation': [mothers_occupation],
-            'Fathers_occupation': [fathers_occupation],
-            'Admission_grade': [admission_grade],
-            'Displaced': [displaced],
-            'Educational_special_needs': [educational_special_needs],
-            'Debtor': [debtor],
-            'Tuition_fees_up_to_date': [tuition_fees_up_to_date],
-            'Gender': [gender],
-            'Scholarship_holder': [scholarship_holder],
-            'Age_at_enrollment': [age_at_enrollment],
-            'International': [international],
-            'Curricular_units_1st_sem_credited': [curricular_units_1st_sem_credited],
-            'Curricular_units_1st_sem_enrolled': [curricular_units_1st_sem_enrolled],
-            'Curricular_units_1st_sem_evaluations': [curricular_units_1st_sem_evaluations],
-            'Curricular_units_1st_sem_approved': [curricular_units_1st_sem_approved],
-            'Curricular_units_1st_sem_grade': [curricular_units_1st_sem_grade],
-            'Curricular_units_1st_sem_without_evaluations': [curricular_units_1st_sem_without_evaluations],
-            'Curricular_units_2nd_sem_credited': [curricular_units_2nd_sem_credited],
-            'Curricular_units_2nd_sem_enrolled': [curricular_units_2nd_sem_enrolled],
-            'Curricular_units_2nd_sem_evaluations': [curricular_units_2nd_sem_evaluations],
-            'Curricular_units_2nd_sem_approved': [curricular_units_2nd_sem_approved],
-            'Curricular_units_2nd_sem_grade': [curricular_units_2nd_sem_grade],
-            'Curricular_units_2nd_sem_without_evaluations': [curricular_units_2nd_sem_without_evaluations],
-            'GDP': [gdp],
-            'Inflation_rate': [inflation_rate],
-            'Unemployment_rate': [unemployment_rate]
-        })
-
-        input_data['avg_grade'] = (input_data['Curricular_units_1st_sem_grade'] + input_data['Curricular_units_2nd_sem_grade']) / 2
-        input_data['approval_rate'] = (input_data['Curricular_units_1st_sem_approved'] + input_data['Curricular_units_2nd_sem_approved']) / \
-                        (input_data['Curricular_units_1st_sem_enrolled'] + input_data['Curricular_units_2nd_sem_enrolled'] + 1e-5)
-        input_data['Age_at_enrollment'] = input_data['Age_at_enrollment']
-        input_data['Debtor'] = input_data['Debtor']
-        input_data['Scholarship_holder'] = input_data['Scholarship_holder']
-        input_data['Tuition_fees_up_to_date'] = input_data['Tuition_fees_up_to_date']
-
-        # Urutkan kolom sesuai dengan fitur yang digunakan saat pelatihan
-        input_data = input_data[scaler.feature_names_in_]
-
-        # Scale features
-        input_data_scaled = scaler.transform(input_data)
-
-        # Make prediction
-        prediction = model.predict(input_data_scaled)
-        probability = model.predict_proba(input_data_scaled)[0][1]
-
-        # Display results
+        # Pipeline yang sama dengan training: fitur turunan + urutan scaler.feature_names_in_
+        with REGISTRY.time('features'):
+            input_vector = pipeline.transform_one(input_record)
+        if drift_monitor is not None:
+            with REGISTRY.time('drift'):
+                drift_monitor.update(input_vector)
+
+        # Make prediction (scaler sudah dilipat ke dalam pohon), pakai cache jika input pernah dihitung
+        with REGISTRY.time('cache_lookup'):
+            cache_key = PredictionCache.make_key(input_vector, bundle.version)
+            cached = prediction_cache.get(cache_key)
+        if cached is None:
+            with REGISTRY.time('predict'):
+                prediction, probability = predictor.predict_one(input_vector)
+            # Faktor penyebab: atribusi per jalur dari array pohon terkompilasi (tanpa xgboost/pandas),
+            # disimpan di entri cache bersama probabilitasnya
+            with REGISTRY.time('explain'):
+                contributions = predictor.contributions(input_vector)[0][0]
+            prediction_cache.put(cache_key, probability, prediction, contributions)
+        else:
+            prediction, probability = cached['prediction'], cached['probability']
+            contributions = cached['contributions']
+
+        reference = predictor.reference_contributions
+        st.session_state['prediction_result'] = {
+            'prediction': prediction,
+            'probability': probability,
+            'contributions': contributions,
+            'feature_names': predictor.feature_names,
+            'cohort_mean': None if reference is None else dict(zip(predictor.feature_names, reference)),
+            'version': bundle.version,
+            'source': bundle.source,
+        }
+    except Exception as e:
+        REGISTRY.inc('prediction_errors_total')
+        st.session_state.pop('prediction_result', None)
+        st.error("❌ Terjadi kesalahan dalam pemrosesan")
+        st.error(f"Detail error: {str(e)}")
+
+    if METRICS_FILE:
+        REGISTRY.write_textfile(METRICS_FILE)
+    if DRIFT_FILE and drift_monitor is not None:
+        drift_monitor.write_snapshot(DRIFT_FILE)
+
+# Panel hasil dirender dari session_state sebagai fragment: widget di dalamnya hanya
+# menjalankan ulang panel ini, dan rerun karena bagian lain tidak menghapus hasil terakhir
+@st.fragment
+def result_panel():
+    result = st.session_state.get('prediction_result')
+    if result is None:
+        return
+    prediction, probability = result['prediction'], result['probability']
+
+    with REGISTRY.time('render'):
         st.markdown("---")
         st.header("📊 Hasil Prediksi")
-        
+
         col_result1, col_result2 = st.columns(2)
-        
+
         with col_result1:
-            if prediction[0] == 1:
+            if prediction == 1:
                 st.markdown(f"""
                     <div class='prediction-box high-risk'>
                         <h3>⚠️ Status: BERISIKO DROPOUT</h3>
@@ -421,33 +401,127 @@ if submitted and model and scaler and label_encoders:
                         <p style='font-size: 20px;'>Probabilitas Bertahan: {1-probability:.2%}</p>
                     </div>
                 """, unsafe_allow_html=True)
-        
-        with col_result2:
-            fig = go.Figure(go.Indicator(
-                mode = "gauge+number",
-                value = probability * 100,
-                domain = {'x': [0, 1], 'y': [0, 1]},
-                title = {'text': "Risiko Dropout (%)"},
-                gauge = {
-                    'axis': {'range': [0, 100]},
-                    'bar': {'color': "darkred" if prediction[0] == 1 else "green"},
-                    'steps': [
-                        {'range': [0, 30], 'color': "lightgreen"},
-                        {'range': [30, 70], 'color': "yellow"},
-                        {'range': [70, 100], 'color': "salmon"}
-                    ],
-                    'threshold': {
-                        'line': {'color': "red", 'width': 4},
-                        'thickness': 0.75,
-                        'value': 70
-                    }
-                }
-            ))
-            st.plotly_chart(fig)
 
-    except Exception as e:
-        st.error("❌ Terjadi kesalahan dalam pemrosesan")
-        st.error(f"Detail error: {str(e)}")
+        with col_result2, REGISTRY.time('gauge'):
+            render_gauge(probability, prediction)
+        st.caption(f"Versi model: {result['version']} ({result['source']})")
+
+    if result['contributions'] is not None:
+        st.subheader("🧭 Faktor Penyebab Risiko")
+        st.caption("Nilai positif menaikkan risiko dropout, nilai negatif menurunkannya.")
+        top_k = st.slider("Jumlah Faktor", min_value=3, max_value=len(result['contributions']), value=DEFAULT_TOP_K)
+        top = top_contributions(result['feature_names'], result['contributions'], top_k)
+        st.plotly_chart(build_contribution_figure(top, result['cohort_mean']))
+
+result_panel()
+
+# Analisis what-if: sapu satu atau dua fitur dari input form terakhir dalam satu inferensi.
+# Fragment: memilih fitur atau menjalankan sapuan tidak menjalankan ulang form dan panel hasil
+@st.fragment
+def what_if_panel(predictor, pipeline, input_record):
+    st.markdown("---")
+    st.header("🔮 Analisis What-If")
+    st.markdown("Lihat perubahan risiko dropout jika satu atau dua fitur dari input terakhir diubah di seluruh rentang validnya.")
+
+    col_sweep1, col_sweep2, col_sweep3 = st.columns(3)
+    with col_sweep1:
+        sweep_x = st.selectbox("Fitur Pertama", options=RAW_COLUMNS,
+                               index=RAW_COLUMNS.index('Curricular_units_2nd_sem_approved'))
+    with col_sweep2:
+        sweep_y = st.selectbox("Fitur Kedua (opsional)", options=["-"] + [c for c in RAW_COLUMNS if c != sweep_x],
+                               index=0)
+    with col_sweep3:
+        sweep_steps = st.slider("Jumlah Titik per Fitur", min_value=5, max_value=MAX_STEPS, value=50)
+
+    if predictor and st.button("📈 Jalankan Analisis What-If"):
+        try:
+            sweep_columns = [sweep_x] if sweep_y == "-" else [sweep_x, sweep_y]
+            domains = load_feature_domains()
+            sweep_grid = [sweep_values(domains[c], sweep_steps) for c in sweep_columns]
+            with REGISTRY.time('what_if'):
+                risk = sweep(predictor, pipeline, input_record, sweep_columns, sweep_grid)
+            REGISTRY.inc('what_if_rows_total', risk.size)
+            st.caption(f"{risk.size} varian dinilai dalam satu panggilan predict_proba")
+            st.plotly_chart(build_sweep_figure(sweep_columns, sweep_grid, risk, input_record))
+        except Exception as e:
+            st.error("❌ Terjadi kesalahan dalam pemrosesan")
+            st.error(f"Detail error: {str(e)}")
+
+what_if_panel(predictor, pipeline, input_record)
+
+with st.sidebar.expander("🗂️ Versi Model"):
+    st.write(f"Aktif: `{bundle.version}`" if bundle is not None else "Tidak ada model aktif")
+    st.json(model_registry.history)
+
+# Alert drift input: input terbaru dibandingkan dengan distribusi data latih
+if drift_monitor is not None:
+    drift_snapshot = drift_monitor.snapshot()
+    if drift_snapshot['alerts']:
+        st.sidebar.warning(f"⚠️ Drift input terdeteksi pada {len(drift_snapshot['alerts'])} fitur")
+    with st.sidebar.expander("📉 Drift Input"):
+        st.write(f"{drift_snapshot['count']} input tercatat sejak {drift_snapshot['since']}")
+        for alert in drift_snapshot['alerts']:
+            st.warning(f"{alert['feature']}: {alert['metric']} = {alert['value']:.3f}")
+        st.download_button(
+            "⬇️ Unduh Snapshot Drift (JSON)",
+            data=json.dumps(drift_snapshot, indent=2),
+            file_name="drift_snapshot.json",
+            mime="application/json"
+        )
+
+with st.sidebar.expander("⚡ Cache Prediksi"):
+    st.json(prediction_cache.stats())
+
+# Prediksi massal untuk satu kohort
+st.markdown("---")
+st.header("📂 Prediksi Massal")
+st.markdown("Unggah file CSV (separator `;`) dengan kolom yang sama seperti `data.csv` untuk menilai seluruh kohort.")
+
+uploaded_file = st.file_uploader("File CSV Kohort", type=["csv"])
+chunksize = st.number_input("Jumlah Baris per Chunk", min_value=100, max_value=100000, value=DEFAULT_CHUNKSIZE, step=100)
+with_contributions = st.checkbox("Sertakan kontribusi fitur (kolom contrib_*)")
+
+if uploaded_file is not None and bundle is not None:
+    if st.button("📊 Prediksi Semua Mahasiswa"):
+        try:
+            with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as output_file:
+                output_path = output_file.name
+            with REGISTRY.time('batch_score'):
+                # Kontribusi dari predictor bundle itu sendiri (juga varian ringkas), sehingga
+                # contrib_* + bias selalu sama dengan log-odds dropout_probability di baris yang sama
+                explainer = predictor if with_contributions else None
+                summary = score_csv(uploaded_file, output_path, predictor, chunksize=int(chunksize),
+                                    pipeline=pipeline, explainer=explainer, model_version=bundle.version,
+                                    drift_monitor=drift_monitor)
+            REGISTRY.inc('batch_rows_total', summary['rows'])
+
+            st.success(
+                f"{summary['rows']} mahasiswa diproses dalam {summary['seconds']:.2f} detik "
+                f"({summary['rows_per_sec']:.0f} baris/detik)"
+            )
+            st.metric("Mahasiswa Berisiko Dropout", summary['at_risk'])
+            with open(output_path, "rb") as f:
+                st.download_button(
+                    "⬇️ Unduh Hasil Prediksi",
+                    data=f,
+                    file_name="hasil_prediksi_kohort.csv",
+                    mime="text/csv"
+                )
+            os.remove(output_path)
+        except Exception as e:
+            st.error("❌ Terjadi kesalahan dalam pemrosesan")
+            st.error(f"Detail error: {str(e)}")
+
+# Panel diagnostik opsional: waktu per tahap dan counter
+if st.sidebar.checkbox("🩺 Tampilkan Diagnostik"):
+    st.sidebar.table(REGISTRY.stage_summary())
+    st.sidebar.json(REGISTRY.counters())
+    st.sidebar.download_button(
+        "⬇️ Unduh Metrik (Prometheus)",
+        data=REGISTRY.render_prometheus(),
+        file_name="metrics.prom",
+        mime="text/plain"
+    )
 
 # Footer
 st.markdown("""
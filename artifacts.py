@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODEL_PATH = os.path.join(BASE_DIR, 'model_dropout_xgboost.pkl')
+SCALER_PATH = os.path.join(BASE_DIR, 'scaler.pkl')
+ENCODERS_PATH = os.path.join(BASE_DIR, 'label_encoders.pkl')
+DATA_PATH = os.path.join(BASE_DIR, 'data.csv')
+
+# Format native hasil export_artifacts.py (tanpa pickle/sklearn)
+NATIVE_MODEL_PATH = os.path.join(BASE_DIR, 'model_dropout_xgboost.ubj')
+COMPILED_MODEL_PATH = os.path.join(BASE_DIR, 'model_compiled.npz')
+SCALER_NPZ_PATH = os.path.join(BASE_DIR, 'scaler.npz')
+ENCODERS_JSON_PATH = os.path.join(BASE_DIR, 'label_encoders.json')
+MANIFEST_PATH = os.path.join(BASE_DIR, 'artifacts_manifest.json')
+FEATURE_PIPELINE_PATH = os.path.join(BASE_DIR, 'feature_pipeline.json')
+# Histogram kode kategori data latih, referensi drift_monitor.py
+DRIFT_REFERENCE_PATH = os.path.join(BASE_DIR, 'drift_reference.json')
+
+# Varian ringkas hasil model_compaction.py beserta metrik hold-out-nya
+COMPACT_MODEL_PATH = os.path.join(BASE_DIR, 'model_compact.npz')
+COMPACT_MANIFEST_PATH = os.path.join(BASE_DIR, 'model_compact.json')
+
+
+class NativeScaler:
+    """Pengganti ringan StandardScaler yang hanya membutuhkan NumPy."""
+
+    def __init__(self, feature_names_in_, mean_, scale_, var_):
+        self.feature_names_in_ = np.asarray(feature_names_in_, dtype=object)
+        self.mean_ = mean_
+        self.scale_ = scale_
+        self.var_ = var_
+        self.n_features_in_ = len(self.feature_names_in_)
+
+    def transform(self, X):
+        if hasattr(X, 'to_numpy'):
+            X = X[list(self.feature_names_in_)].to_numpy(dtype=np.float64)
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['feature_names'].tolist(), data['mean'], data['scale'], data['var'])
+
+
+def load_artifacts():
+    """Muat model, scaler dan label encoder; kembalikan (None, None, None) jika gagal."""
+    try:
+        paths = [MODEL_PATH, SCALER_PATH, ENCODERS_PATH]
+        if not all(map(os.path.exists, paths)):
+            return None, None, None
+
+        import joblib
+
+        model = joblib.load(MODEL_PATH)
+        scaler = joblib.load(SCALER_PATH)
+        label_encoders = joblib.load(ENCODERS_PATH)
+        if not label_encoders:
+            return None, None, None
+
+        return model, scaler, label_encoders
+    except Exception:
+        return None, None, None
+
+
+def pickle_digest():
+    """SHA-256 gabungan file pickle; dipakai untuk mendeteksi export native yang sudah basi."""
+    digest = hashlib.sha256()
+    for path in (MODEL_PATH, SCALER_PATH, ENCODERS_PATH):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def artifact_signature(paths=(MODEL_PATH, SCALER_PATH, ENCODERS_PATH,
+                              COMPILED_MODEL_PATH, SCALER_NPZ_PATH, ENCODERS_JSON_PATH,
+                              FEATURE_PIPELINE_PATH, DRIFT_REFERENCE_PATH, COMPACT_MODEL_PATH,
+                              COMPACT_MANIFEST_PATH)):
+    """Sidik jari (mtime, ukuran) file artefak; berubah setiap kali artefak ditimpa."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def load_native_artifacts():
+    """Muat (predictor, scaler, label_encoders) dari format native tanpa mengimpor xgboost/sklearn.
+
+    Kembalikan (None, None, None) jika file hasil export belum ada atau gagal dibaca.
+    """
+    from compiled_predictor import CompiledPredictor
+
+    try:
+        paths = [COMPILED_MODEL_PATH, SCALER_NPZ_PATH, ENCODERS_JSON_PATH, MANIFEST_PATH]
+        if not all(map(os.path.exists, paths)):
+            return None, None, None
+
+        # Jangan pakai hasil export lama jika pickle sudah dilatih ulang
+        with open(MANIFEST_PATH, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if os.path.exists(MODEL_PATH) and manifest.get('source_digest') != pickle_digest():
+            return None, None, None
+
+        predictor = CompiledPredictor.load(COMPILED_MODEL_PATH)
+        scaler = NativeScaler.load(SCALER_NPZ_PATH)
+        with open(ENCODERS_JSON_PATH, encoding='utf-8') as f:
+            label_encoders = json.load(f)
+        if not label_encoders:
+            return None, None, None
+
+        return predictor, scaler, label_encoders
+    except Exception:
+        return None, None, None
+
+
+def load_compact_predictor(tolerance):
+    """Muat (predictor, manifest) varian ringkas jika akurasinya turun paling banyak `tolerance`.
+
+    Varian diabaikan jika belum ada, dibuat dari pickle lain, atau di luar toleransi;
+    kembalikan (None, None) pada kasus tersebut.
+    """
+    from compiled_predictor import CompiledPredictor
+
+    try:
+        if not (os.path.exists(COMPACT_MODEL_PATH) and os.path.exists(COMPACT_MANIFEST_PATH)):
+            return None, None
+        with open(COMPACT_MANIFEST_PATH, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if os.path.exists(MODEL_PATH) and manifest.get('source_digest') != pickle_digest():
+            return None, None
+        if manifest['accuracy_delta'] < -tolerance:
+            return None, None
+        return CompiledPredictor.load(COMPACT_MODEL_PATH), manifest
+    except Exception:
+        return None, None
+
+
+
+def load_feature_pipeline():
+    """Muat FeaturePipeline yang disimpan bersama model; pakai konfigurasi bawaan jika belum ada."""
+    from feature_pipeline import FeaturePipeline
+
+    if os.path.exists(FEATURE_PIPELINE_PATH):
+        return FeaturePipeline.load(FEATURE_PIPELINE_PATH)
+    return FeaturePipeline()
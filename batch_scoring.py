@@ -0,0 +1,119 @@
+import argparse
+import sys
+import time
+
+from artifacts import load_artifacts, load_feature_pipeline
+from compiled_predictor import CompiledPredictor
+from drift_monitor import load_drift_monitor
+from explanations import contribution_columns
+from feature_pipeline import FeaturePipeline
+from model_registry import bundle_version
+
+DEFAULT_CHUNKSIZE = 5000
+
+
+def score_matrix(features, model, scaler=None):
+    """Hitung probabilitas dan label dropout dari matriks fitur dengan satu panggilan predict_proba.
+
+    Jika scaler None, model dianggap menerima fitur mentah (mis. CompiledPredictor).
+    """
+    if scaler is None:
+        probability = model.predict_proba(features)
+    else:
+        import pandas as pd
+
+        # DataFrame tanpa salinan hanya agar scaler mengenali nama fiturnya
+        frame = pd.DataFrame(features, columns=scaler.feature_names_in_, copy=False)
+        probability = model.predict_proba(scaler.transform(frame))[:, 1]
+    # Sama dengan XGBClassifier.predict untuk kasus biner
+    prediction = (probability > 0.5).astype('int8')
+    return probability, prediction
+
+
+def iter_scored_chunks(source, model, scaler=None, chunksize=DEFAULT_CHUNKSIZE, pipeline=None,
+                       explainer=None, model_version=None, drift_monitor=None):
+    """Baca CSV ber-separator ';' per chunk dan kembalikan tiap chunk beserta hasil prediksinya.
+
+    Jika explainer diberikan (objek dengan `feature_names` dan `contributions(fitur)`, mis.
+    CompiledPredictor atau Explainer), kolom `contrib_<fitur>` ikut ditambahkan dari matriks fitur yang sama;
+    jika model_version diberikan, setiap baris ditandai dengan kolom `model_version`;
+    jika drift_monitor diberikan, matriks fitur setiap chunk ikut dicatat.
+    """
+    # Impor pandas ditunda agar jalur prediksi interaktif tidak ikut memuatnya
+    import pandas as pd
+
+    pipeline = pipeline or FeaturePipeline()
+    for chunk in pd.read_csv(source, sep=';', chunksize=chunksize):
+        features = pipeline.transform(chunk)
+        if drift_monitor is not None:
+            drift_monitor.update(features)
+        probability, prediction = score_matrix(features, model, scaler)
+        chunk['dropout_probability'] = probability
+        chunk['prediction'] = prediction
+        if model_version is not None:
+            chunk['model_version'] = model_version
+        if explainer is not None:
+            contribs, _ = explainer.contributions(features)
+            chunk = chunk.assign(**contribution_columns(explainer.feature_names, contribs))
+        yield chunk
+
+
+def score_csv(source, destination, model, scaler=None, chunksize=DEFAULT_CHUNKSIZE, pipeline=None,
+              explainer=None, model_version=None, drift_monitor=None):
+    """Skor seluruh file secara bertahap dan tulis hasilnya per chunk ke destination."""
+    start = time.perf_counter()
+    rows = 0
+    at_risk = 0
+    chunks = iter_scored_chunks(source, model, scaler, chunksize, pipeline, explainer, model_version, drift_monitor)
+    for i, chunk in enumerate(chunks):
+        chunk.to_csv(destination, sep=';', index=False, header=(i == 0), mode='w' if i == 0 else 'a')
+        rows += len(chunk)
+        at_risk += int(chunk['prediction'].sum())
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'at_risk': at_risk,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skor dropout untuk seluruh kohort dari file CSV (separator ';').")
+    parser.add_argument('input', help="File CSV masukan dengan format yang sama seperti data.csv")
+    parser.add_argument('output', help="File CSV keluaran")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help="Jumlah baris per chunk")
+    parser.add_argument('--contributions', choices=['approx', 'exact'],
+                        help="Tambahkan kolom contrib_<fitur> (approx: per jalur pohon, exact: TreeSHAP)")
+    parser.add_argument('--drift-report', help="Tulis snapshot drift input (JSON) ke file ini")
+    args = parser.parse_args(argv)
+
+    model, scaler, label_encoders = load_artifacts()
+    if model is None:
+        print("Model, scaler atau label encoder tidak dapat dimuat.", file=sys.stderr)
+        return 1
+
+    explainer = None
+    if args.contributions == 'approx':
+        # Atribusi per jalur dari pohon terkompilasi, sama dengan jalur interaktif aplikasi
+        explainer = CompiledPredictor.from_model(model, scaler)
+    elif args.contributions == 'exact':
+        from explanations import Explainer
+
+        explainer = Explainer(model.get_booster(), scaler)
+    drift_monitor = load_drift_monitor(scaler) if args.drift_report else None
+    if args.drift_report and drift_monitor is None:
+        print("Referensi drift belum ada; jalankan export_artifacts.py. Laporan drift dilewati.", file=sys.stderr)
+    summary = score_csv(args.input, args.output, model, scaler, args.chunksize, load_feature_pipeline(),
+                        explainer, bundle_version(), drift_monitor)
+    print(f"{summary['rows']} baris diproses dalam {summary['seconds']:.2f} detik "
+          f"({summary['rows_per_sec']:.0f} baris/detik), {summary['at_risk']} berisiko dropout")
+    if drift_monitor is not None:
+        drift_monitor.write_snapshot(args.drift_report)
+        for alert in drift_monitor.snapshot()['alerts']:
+            print(f"DRIFT {alert['feature']}: {alert['metric']} = {alert['value']:.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
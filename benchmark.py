@@ -0,0 +1,209 @@
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+import startup_benchmark
+from artifacts import DATA_PATH, load_artifacts, load_feature_pipeline, load_native_artifacts
+from batch_scoring import score_matrix
+from drift_monitor import load_drift_monitor
+from feature_pipeline import RAW_COLUMNS
+from prediction_cache import PredictionCache
+
+DEFAULT_BATCH_SIZES = [1, 32, 256, 4096]
+DEFAULT_THRESHOLD = 0.10
+
+# Arah "lebih baik" tiap satuan metrik, dipakai saat membandingkan dengan baseline
+LOWER_IS_BETTER = {'us', 'ms', 's', 'mb'}
+HIGHER_IS_BETTER = {'rows/s'}
+
+
+def _metric(value, unit):
+    return {'value': float(value), 'unit': unit}
+
+
+def _timeit(fn, repeat):
+    timings = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return timings
+
+
+def _submit(record, predictor, pipeline, drift_monitor, cache, version):
+    """Satu submit form seperti di app.py; kembalikan durasi tiap tahap (detik) dan apakah cache kena."""
+    timings = {}
+    start = time.perf_counter()
+    vector = pipeline.transform_one(record)
+    timings['features'] = time.perf_counter() - start
+    if drift_monitor is not None:
+        start = time.perf_counter()
+        drift_monitor.update(vector)
+        timings['drift'] = time.perf_counter() - start
+    start = time.perf_counter()
+    key = PredictionCache.make_key(vector, version)
+    cached = cache.get(key)
+    timings['cache_lookup'] = time.perf_counter() - start
+    if cached is None:
+        start = time.perf_counter()
+        prediction, probability = predictor.predict_one(vector)
+        timings['predict'] = time.perf_counter() - start
+        start = time.perf_counter()
+        contributions = predictor.contributions(vector)[0][0]
+        timings['explain'] = time.perf_counter() - start
+        start = time.perf_counter()
+        cache.put(key, probability, prediction, contributions)
+        timings['cache_put'] = time.perf_counter() - start
+    return timings, cached is not None
+
+
+def bench_single_row(records, predictor, pipeline, drift_monitor, repeat):
+    """Latensi per mahasiswa melalui jalur submit form di app.py, total dan per tahap.
+
+    Tahap: pipeline.transform_one, drift update, lookup cache, predict_one, kontribusi dan simpan
+    ke cache. Putaran pertama memakai input berbeda (cache miss); putaran kedua mengulang input
+    yang sama untuk latensi cache hit.
+    """
+    cache = PredictionCache(max_entries=repeat)
+    rows = [records[i % len(records)] for i in range(repeat)]
+    # Baris duplikat di data sudah kena cache pada putaran pertama; hanya submit yang benar-benar miss/hit dihitung
+    first = [_submit(record, predictor, pipeline, drift_monitor, cache, 'benchmark') for record in rows]
+    second = [_submit(record, predictor, pipeline, drift_monitor, cache, 'benchmark') for record in rows]
+    miss = [timings for timings, was_hit in first if not was_hit]
+    hit = [timings for timings, was_hit in second if was_hit]
+
+    totals = np.array([sum(t.values()) for t in miss]) * 1e6
+    metrics = {f'single_row_p{p}': _metric(np.percentile(totals, p), 'us') for p in (50, 95, 99)}
+    for stage in miss[0]:
+        timings = np.array([t[stage] for t in miss]) * 1e6
+        for p in (50, 95):
+            metrics[f'single_row_{stage}_p{p}'] = _metric(np.percentile(timings, p), 'us')
+    hit_totals = np.array([sum(t.values()) for t in hit]) * 1e6
+    metrics['single_row_cache_hit_p50'] = _metric(np.percentile(hit_totals, 50), 'us')
+    return metrics
+
+
+def bench_batch(data, predictor, pipeline, batch_sizes, min_rows):
+    """Throughput batch scoring (pipeline.transform + score_matrix) untuk beberapa ukuran batch."""
+    results = {}
+    for size in batch_sizes:
+        batch = pd.concat([data] * (size // len(data) + 1), ignore_index=True).iloc[:size]
+        repeat = max(3, min_rows // size)
+        timings = _timeit(lambda: score_matrix(pipeline.transform(batch), predictor), repeat)
+        results[f'batch_{size}_throughput'] = _metric(size / np.median(timings), 'rows/s')
+    return results
+
+
+def bench_load():
+    """Waktu memuat artefak di dalam proses (native vs pickle)."""
+    start = time.perf_counter()
+    load_native_artifacts()
+    native = time.perf_counter() - start
+    start = time.perf_counter()
+    load_artifacts()
+    pickle = time.perf_counter() - start
+    return {
+        'load_native_ms': _metric(native * 1000, 'ms'),
+        'load_pickle_ms': _metric(pickle * 1000, 'ms'),
+    }
+
+
+def run(batch_sizes=DEFAULT_BATCH_SIZES, repeat=2000, min_rows=50000, startup_repeat=3):
+    data = pd.read_csv(DATA_PATH, sep=';')[RAW_COLUMNS]
+    records = data.to_dict(orient='records')
+    predictor, scaler, _ = load_native_artifacts()
+    pipeline = load_feature_pipeline()
+    if predictor is None:
+        raise RuntimeError("Artefak native belum ada; jalankan export_artifacts.py terlebih dahulu")
+    drift_monitor = load_drift_monitor(scaler)
+
+    metrics = {}
+    metrics.update(bench_load())
+    metrics.update(bench_single_row(records, predictor, pipeline, drift_monitor, repeat))
+    metrics.update(bench_batch(data, predictor, pipeline, batch_sizes, min_rows))
+    for name, result in startup_benchmark.run(startup_repeat).items():
+        metrics[f'cold_start_{name}_s'] = _metric(result['wall_seconds_median'], 's')
+        metrics[f'cold_start_{name}_rss_mb'] = _metric(result['max_rss_mb_median'], 'mb')
+    metrics['peak_rss_mb'] = _metric(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 'mb')
+
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'metrics': metrics,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Kembalikan daftar metrik yang memburuk lebih dari threshold (relatif) terhadap baseline.
+
+    Raise ValueError untuk satuan yang tidak ada di LOWER_IS_BETTER maupun HIGHER_IS_BETTER.
+    """
+    regressions = []
+    for name, base in baseline['metrics'].items():
+        if name not in current['metrics'] or base['value'] == 0:
+            continue
+        value = current['metrics'][name]['value']
+        change = (value - base['value']) / base['value']
+        if base['unit'] in HIGHER_IS_BETTER:
+            change = -change
+        elif base['unit'] not in LOWER_IS_BETTER:
+            raise ValueError(f"Satuan metrik {name} tidak dikenal: {base['unit']}")
+        if change > threshold:
+            regressions.append({'metric': name, 'baseline': base['value'], 'current': value,
+                                'unit': base['unit'], 'change': change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latensi, throughput, waktu muat dan memori prediksi dropout.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Jalankan benchmark dan tulis hasil JSON")
+    run_parser.add_argument('--output', help="File JSON hasil (bawaan: stdout)")
+    run_parser.add_argument('--batch-sizes', type=int, nargs='+', default=DEFAULT_BATCH_SIZES)
+    run_parser.add_argument('--repeat', type=int, default=2000, help="Jumlah prediksi satu baris yang diukur")
+    run_parser.add_argument('--startup-repeat', type=int, default=3)
+
+    compare_parser = subparsers.add_parser('compare', help="Bandingkan hasil dengan baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="Batas penurunan relatif yang ditoleransi (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run(args.batch_sizes, args.repeat, startup_repeat=args.startup_repeat)
+        output = json.dumps(report, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        else:
+            print(output)
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    try:
+        regressions = compare(baseline, current, args.threshold)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    for r in regressions:
+        print(f"REGRESI {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} {r['unit']} "
+              f"({r['change']:+.1%} lebih buruk)")
+    if not regressions:
+        print(f"Tidak ada regresi di atas {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
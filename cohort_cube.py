@@ -0,0 +1,101 @@
+import itertools
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = [
+    'Course', 'Application_mode', 'Scholarship_holder', 'Debtor', 'Tuition_fees_up_to_date',
+    'Gender', 'Marital_status', 'Daytime_evening_attendance', 'Displaced', 'International',
+]
+STATUSES = ['Dropout', 'Enrolled', 'Graduate']
+# Cuboid dengan 0..MAX_PRECOMPUTED dimensi disimpan terpisah; kueri lain memakai cuboid dasar
+MAX_PRECOMPUTED = 2
+
+
+def _aggregate(cells, dims):
+    if not dims:
+        return cells[STATUSES].sum().to_frame().T
+    return cells.groupby(level=list(dims), observed=True)[STATUSES].sum()
+
+
+class CohortCube:
+    """Cube agregat jumlah Dropout/Enrolled/Graduate per kombinasi dimensi.
+
+    Cuboid dasar menyimpan jumlah per kombinasi lengkap `dimensions`; semua cuboid
+    dengan paling banyak MAX_PRECOMPUTED dimensi dihitung di muka sehingga kueri
+    group-by/filter umum hanya menjumlahkan beberapa ratus sel, bukan memindai baris mentah.
+    """
+
+    def __init__(self, dimensions=DIMENSIONS):
+        self.dimensions = list(dimensions)
+        self.rows = 0
+        self.cuboids = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, data, dimensions=DIMENSIONS):
+        cube = cls(dimensions)
+        cube.append(data)
+        return cube
+
+    def _base_cells(self, data):
+        frame = pd.DataFrame({d: np.asarray(data[d]) for d in self.dimensions})
+        frame['Status'] = np.asarray(data['Status'], dtype=object)
+        cells = frame.groupby(self.dimensions + ['Status']).size().unstack(fill_value=0)
+        return cells.reindex(columns=STATUSES, fill_value=0).astype('int64')
+
+    def append(self, data):
+        """Tambahkan baris mahasiswa baru; setiap cuboid diperbarui dengan agregat baris baru saja."""
+        if not len(data):
+            return self
+        new_cells = self._base_cells(data)
+        base = tuple(self.dimensions)
+        keys = [base] + [
+            dims
+            for size in range(MAX_PRECOMPUTED + 1)
+            for dims in itertools.combinations(self.dimensions, size)
+        ]
+        with self._lock:
+            # Bangun dict baru lalu tukar sekaligus agar kueri paralel tidak melihat cube setengah diperbarui
+            cuboids = dict(self.cuboids)
+            for dims in keys:
+                delta = new_cells if dims == base else _aggregate(new_cells, dims)
+                current = cuboids.get(dims)
+                cuboids[dims] = delta if current is None else current.add(delta, fill_value=0).astype('int64')
+            self.cuboids = cuboids
+            self.rows += len(data)
+        return self
+
+    def _cuboid_for(self, cuboids, dims):
+        """Cuboid terkecil yang memuat semua dimensi kueri."""
+        ordered = tuple(d for d in self.dimensions if d in dims)
+        if len(ordered) <= MAX_PRECOMPUTED:
+            return cuboids[ordered]
+        return cuboids[tuple(self.dimensions)]
+
+    def query(self, group_by=(), filters=None):
+        """Jumlah per status dan dropout_rate untuk group_by, dengan filter {dimensi: nilai atau daftar nilai}."""
+        filters = filters or {}
+        unknown = [d for d in list(group_by) + list(filters) if d not in self.dimensions]
+        if unknown:
+            raise ValueError(f"Dimensi tidak dikenal: {', '.join(unknown)}")
+
+        cells = self._cuboid_for(self.cuboids, set(group_by) | set(filters))
+        if filters:
+            mask = pd.Series(True, index=cells.index)
+            for dim, values in filters.items():
+                values = values if isinstance(values, (list, tuple, set)) else [values]
+                mask &= cells.index.get_level_values(dim).isin(values)
+            cells = cells[mask.to_numpy()]
+
+        result = _aggregate(cells, [d for d in self.dimensions if d in group_by]).copy()
+        result['total'] = result[STATUSES].sum(axis=1)
+        result['dropout_rate'] = result['Dropout'] / result['total'].where(result['total'] > 0)
+        return result
+
+    def timed_query(self, group_by=(), filters=None):
+        start = time.perf_counter()
+        result = self.query(group_by, filters)
+        return result, time.perf_counter() - start
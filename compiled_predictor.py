@@ -0,0 +1,226 @@
+import json
+import math
+
+import numpy as np
+
+
+def raw_threshold(cond, mean, scale):
+    """Cari threshold mentah terkecil yang masuk cabang kanan.
+
+    XGBoost membandingkan nilai terskala setelah dibulatkan ke float32, sehingga
+    `cond * scale + mean` saja bisa meleset satu ulp tepat di nilai data (mis. 0/1).
+    Bisection memastikan `x < threshold` identik dengan `float32((x - mean) / scale) < cond`.
+    """
+    cond = np.float32(cond)
+
+    def goes_right(x):
+        return np.float32((x - mean) / scale) >= cond
+
+    guess = float(cond) * scale + mean
+    delta = (abs(guess) + scale) * 1e-6
+    lo, hi = guess - delta, guess + delta
+    while goes_right(lo):
+        lo -= delta
+        delta *= 2
+    while not goes_right(hi):
+        hi += delta
+        delta *= 2
+    while True:
+        mid = (lo + hi) / 2
+        if mid <= lo or mid >= hi:
+            return hi
+        if goes_right(mid):
+            hi = mid
+        else:
+            lo = mid
+
+
+class CompiledPredictor:
+    """Ensembel XGBoost yang diratakan menjadi array NumPy dengan StandardScaler dilipat ke threshold.
+
+    Setiap split `(x - mean) / scale < t` pada ruang terskala ditulis ulang menjadi
+    `x < t'` pada ruang mentah (lihat `raw_threshold`), sehingga prediksi cukup memakai vektor fitur mentah
+    (urutan `feature_names`) tanpa DataFrame maupun scaler.transform.
+    """
+
+    def __init__(self, feature_names, roots, feature, threshold, left, right, default_left, value,
+                 base_margin, max_depth, mean_value, reference_contributions=None):
+        self.feature_names = list(feature_names)
+        self.roots = roots
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.value = value
+        self.base_margin = base_margin
+        self.max_depth = max_depth
+        # Nilai harapan tiap node (rata-rata daun berbobot cover), untuk atribusi per jalur
+        self.mean_value = mean_value
+        # Rata-rata kontribusi per fitur pada data latih, pembanding di panel penjelasan (opsional)
+        self.reference_contributions = reference_contributions
+
+    @classmethod
+    def from_model(cls, model, scaler):
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        config = json.loads(booster.save_raw('json'))['learner']
+        objective = config['objective']['name']
+        if objective != 'binary:logistic':
+            raise ValueError(f"Objective {objective} tidak didukung")
+
+        base_score = float(config['learner_model_param']['base_score'].strip('[]'))
+        trees = config['gradient_booster']['model']['trees']
+        mean = np.asarray(scaler.mean_, dtype=np.float64)
+        scale = np.asarray(scaler.scale_, dtype=np.float64)
+
+        roots, feature, threshold, left, right, default_left, value, mean_value = [], [], [], [], [], [], [], []
+        max_depth = 0
+        for tree in trees:
+            if any(tree['split_type']):
+                raise ValueError("Split kategorikal tidak didukung")
+            offset = len(feature)
+            roots.append(offset)
+            # Hanya node yang terjangkau dari akar (urutan level); updater prune XGBoost
+            # meninggalkan node yang sudah dihapus di dalam array pohon
+            order = [0]
+            for node in order:
+                if tree['left_children'][node] != -1:
+                    order.extend((tree['left_children'][node], tree['right_children'][node]))
+            index = {node: offset + i for i, node in enumerate(order)}
+            # Sama dengan FillNodeMeanValues XGBoost: daun = nilai daun, split = rata-rata anak berbobot sum_hessian
+            hessian, node_mean = tree['sum_hessian'], {}
+            for node in reversed(order):
+                lc, rc = tree['left_children'][node], tree['right_children'][node]
+                if lc == -1:
+                    node_mean[node] = tree['split_conditions'][node]
+                else:
+                    node_mean[node] = (node_mean[lc] * hessian[lc] + node_mean[rc] * hessian[rc]) / hessian[node]
+            depth = {0: 0}
+            for node in order:
+                lc, rc = tree['left_children'][node], tree['right_children'][node]
+                f = tree['split_indices'][node]
+                cond = tree['split_conditions'][node]
+                if lc == -1:
+                    # Daun menunjuk ke dirinya sendiri agar traversal dengan kedalaman tetap aman
+                    feature.append(0)
+                    threshold.append(0.0)
+                    left.append(index[node])
+                    right.append(index[node])
+                    default_left.append(True)
+                    value.append(cond)
+                    mean_value.append(node_mean[node])
+                else:
+                    depth[lc] = depth[rc] = depth[node] + 1
+                    feature.append(f)
+                    threshold.append(raw_threshold(cond, mean[f], scale[f]))
+                    left.append(index[lc])
+                    right.append(index[rc])
+                    default_left.append(bool(tree['default_left'][node]))
+                    value.append(0.0)
+                    mean_value.append(node_mean[node])
+            max_depth = max(max_depth, max(depth.values()))
+
+        return cls(
+            feature_names=scaler.feature_names_in_,
+            roots=np.asarray(roots, dtype=np.intp),
+            feature=np.asarray(feature, dtype=np.intp),
+            threshold=np.asarray(threshold, dtype=np.float64),
+            left=np.asarray(left, dtype=np.intp),
+            right=np.asarray(right, dtype=np.intp),
+            default_left=np.asarray(default_left, dtype=bool),
+            value=np.asarray(value, dtype=np.float64),
+            base_margin=math.log(base_score / (1 - base_score)),
+            max_depth=max_depth,
+            mean_value=np.asarray(mean_value, dtype=np.float64),
+        )
+
+    _ARRAYS = ('roots', 'feature', 'threshold', 'left', 'right', 'default_left', 'value', 'mean_value')
+
+    def save(self, path):
+        """Simpan array pohon ke file .npz agar serving cukup memakai NumPy."""
+        np.savez(
+            path,
+            feature_names=np.asarray(self.feature_names),
+            base_margin=np.float64(self.base_margin),
+            max_depth=np.int64(self.max_depth),
+            **{name: getattr(self, name) for name in self._ARRAYS},
+            **({'reference_contributions': self.reference_contributions}
+               if self.reference_contributions is not None else {}),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                feature_names=data['feature_names'].tolist(),
+                base_margin=float(data['base_margin']),
+                max_depth=int(data['max_depth']),
+                reference_contributions=data['reference_contributions'] if 'reference_contributions' in data else None,
+                **{name: data[name] for name in cls._ARRAYS},
+            )
+
+    def _leaves(self, X):
+        # X: (n_rows, n_features); semua pohon ditelusuri bersamaan, satu level per iterasi
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        has_missing = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = x < self.threshold[node]
+            if has_missing:
+                go_left = np.where(np.isnan(x), self.default_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X):
+        """Probabilitas dropout untuk matriks fitur mentah berurutan `feature_names`."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        margin = self.value[self._leaves(X)].sum(axis=1) + self.base_margin
+        return 1.0 / (1.0 + np.exp(-margin))
+
+    def predict_one(self, x):
+        """Kembalikan (label, probabilitas) untuk satu vektor fitur mentah dari satu kali traversal."""
+        x = np.asarray(x, dtype=np.float64)
+        has_missing = np.isnan(x).any()
+        node = self.roots
+        for _ in range(self.max_depth):
+            v = x[self.feature[node]]
+            go_left = v < self.threshold[node]
+            if has_missing:
+                go_left = np.where(np.isnan(v), self.default_left[node], go_left)
+            node = np.where(go_left, self.left[node], self.right[node])
+        margin = self.value[node].sum() + self.base_margin
+        probability = 1.0 / (1.0 + math.exp(-margin))
+        return int(probability > 0.5), probability
+
+    def contributions(self, X):
+        """Kembalikan (kontribusi [n, fitur], bias [n]) dalam log-odds dengan atribusi per jalur pohon.
+
+        Setiap split menyumbang `mean_value[anak] - mean_value[node]` ke fiturnya (Saabas), sama
+        dengan `pred_contribs` + `approx_contribs=True` XGBoost tetapi tanpa xgboost maupun scaler.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        n_rows, n_features = X.shape[0], len(self.feature_names)
+        rows = np.arange(n_rows)[:, None]
+        node = np.broadcast_to(self.roots, (n_rows, len(self.roots)))
+        has_missing = np.isnan(X).any()
+        contribs = np.zeros(n_rows * n_features)
+        for _ in range(self.max_depth):
+            f = self.feature[node]
+            x = X[rows, f]
+            go_left = x < self.threshold[node]
+            if has_missing:
+                go_left = np.where(np.isnan(x), self.default_left[node], go_left)
+            child = np.where(go_left, self.left[node], self.right[node])
+            # Daun menunjuk ke dirinya sendiri, jadi selisihnya 0 setelah jalur selesai
+            contribs += np.bincount((rows * n_features + f).ravel(),
+                                    weights=(self.mean_value[child] - self.mean_value[node]).ravel(),
+                                    minlength=n_rows * n_features)
+            node = child
+        bias = self.base_margin + self.mean_value[self.roots].sum()
+        return contribs.reshape(n_rows, n_features), np.full(n_rows, bias)
+
+    def fit_reference(self, X):
+        """Simpan rata-rata kontribusi per fitur atas X (mis. seluruh data latih) sebagai pembanding."""
+        self.reference_contributions = self.contributions(X)[0].mean(axis=0)
+        return self
@@ -0,0 +1,156 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import BASE_DIR, DATA_PATH
+
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, '.dataset_cache')
+CACHE_VERSION = 1
+CATEGORICAL_COLUMNS = ['Status']
+# Digest terakhir per file, dipakai ulang selama ukuran dan mtime-nya tidak berubah
+_DIGESTS = {}
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_signature(path):
+    """(path absolut, ukuran, mtime_ns): cukup satu stat, berubah setiap kali file ditimpa."""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def cached_file_digest(path):
+    """file_digest yang hanya membaca ulang file jika file_signature-nya berubah."""
+    signature = file_signature(path)
+    cached = _DIGESTS.get(signature[0])
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    digest = file_digest(path)
+    _DIGESTS[signature[0]] = (signature, digest)
+    return digest
+
+
+def _compact(data):
+    """Ubah kolom ke tipe terkecil: kode integer -> int8/int16, float -> float32, Status -> kategori."""
+    columns = {}
+    lossy = []
+    for col in data.columns:
+        values = data[col]
+        if col in CATEGORICAL_COLUMNS or values.dtype == object:
+            columns[col] = values.astype('category')
+        elif np.issubdtype(values.dtype, np.integer):
+            columns[col] = pd.to_numeric(values, downcast='integer')
+        else:
+            compact = values.astype(np.float32)
+            if not np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+                lossy.append(col)
+            columns[col] = compact
+    return columns, lossy
+
+
+def build_cache(path=DATA_PATH, cache_dir=DEFAULT_CACHE_DIR, digest=None):
+    """Parse CSV sekali dan simpan tiap kolom sebagai .npy di cache_dir/<sha256>."""
+    digest = digest or cached_file_digest(path)
+    target = os.path.join(cache_dir, digest)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    columns, lossy = _compact(pd.read_csv(path, sep=';'))
+    # Tulis ke direktori sementara lalu rename agar pembaca lain tidak melihat cache setengah jadi
+    staging = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp-')
+    meta = {'version': CACHE_VERSION, 'source': os.path.abspath(path), 'rows': 0,
+            'columns': [], 'categories': {}, 'float32_lossy': lossy}
+    for i, (col, values) in enumerate(columns.items()):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            meta['categories'][col] = [str(c) for c in values.cat.categories]
+            array = values.cat.codes.to_numpy()
+        else:
+            array = values.to_numpy()
+        np.save(os.path.join(staging, f'{i}.npy'), array)
+        meta['columns'].append({'name': col, 'file': f'{i}.npy', 'dtype': array.dtype.name})
+        meta['rows'] = len(array)
+    with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    try:
+        os.rename(staging, target)
+    except OSError:
+        # Proses lain sudah menulis cache yang sama
+        shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+def load_dataset(path=DATA_PATH, cache_dir=DEFAULT_CACHE_DIR):
+    """Muat data.csv sebagai DataFrame ringkas yang di-memory-map dari cache (dibuat jika belum ada).
+
+    Kolom hanya-baca dan tidak disalin ke memori; float disimpan sebagai float32 sehingga
+    kolom di `meta['float32_lossy']` tidak identik dengan hasil pd.read_csv. Untuk melatih
+    model yang dipakai serving, tetap gunakan nilai float64 dari CSV.
+    """
+    digest = cached_file_digest(path)
+    target = os.path.join(cache_dir, digest)
+    meta_path = os.path.join(target, 'meta.json')
+    if not os.path.exists(meta_path):
+        build_cache(path, cache_dir, digest)
+
+    with open(meta_path, encoding='utf-8') as f:
+        meta = json.load(f)
+    columns = {}
+    for column in meta['columns']:
+        array = np.load(os.path.join(target, column['file']), mmap_mode='r')
+        name = column['name']
+        if name in meta['categories']:
+            columns[name] = pd.Categorical.from_codes(array, categories=meta['categories'][name])
+        else:
+            columns[name] = array
+    return pd.DataFrame(columns, copy=False)
+
+
+def memory_report(path=DATA_PATH, cache_dir=DEFAULT_CACHE_DIR):
+    start = time.perf_counter()
+    plain = pd.read_csv(path, sep=';')
+    plain_seconds = time.perf_counter() - start
+    plain_bytes = int(plain.memory_usage(deep=True).sum())
+    del plain
+
+    load_dataset(path, cache_dir)
+    start = time.perf_counter()
+    compact = load_dataset(path, cache_dir)
+    cached_seconds = time.perf_counter() - start
+    compact_bytes = int(compact.memory_usage(deep=True).sum())
+
+    return {
+        'rows': len(compact),
+        'pandas_bytes': plain_bytes,
+        'cached_bytes': compact_bytes,
+        'memory_reduction': 1 - compact_bytes / plain_bytes,
+        'pandas_load_seconds': plain_seconds,
+        'cached_load_seconds': cached_seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bangun cache kolumnar data.csv dan laporkan penghematan memori.")
+    parser.add_argument('path', nargs='?', default=DATA_PATH)
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(memory_report(args.path, args.cache_dir), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from artifacts import DATA_PATH, DRIFT_REFERENCE_PATH
+from feature_pipeline import CODE_COLUMNS
+
+PSI_THRESHOLD = 0.2
+SHIFT_THRESHOLD = 0.5
+# Jumlah observasi minimum sebelum alert dinilai
+MIN_COUNT = 100
+PSI_EPSILON = 1e-4
+# Baris tunggal ditampung dulu lalu dilipat ke statistik per blok
+BUFFER_ROWS = 256
+# Jarak antar kolom pada kunci gabungan (indeks kolom * KEY_STRIDE + kode); kode terbesar < 10000
+KEY_STRIDE = 1_000_000
+
+
+def reference_histograms(path=DATA_PATH, columns=CODE_COLUMNS):
+    """Frekuensi kode kategori di data latih: {kolom: {kode: jumlah}} (dibaca dengan modul csv)."""
+    counts = {col: {} for col in columns}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for record in csv.DictReader(f, delimiter=';'):
+            for col in columns:
+                code = int(float(record[col]))
+                counts[col][code] = counts[col].get(code, 0) + 1
+    return counts
+
+
+def code_histograms(X, feature_names, columns=CODE_COLUMNS):
+    """Frekuensi kode kategori dari matriks fitur berurutan `feature_names` (format sama dengan reference_histograms)."""
+    X = np.asarray(X)
+    feature_names = [str(name) for name in feature_names]
+    counts = {}
+    for col in columns:
+        if col in feature_names:
+            codes, n = np.unique(X[:, feature_names.index(col)].astype(np.int64), return_counts=True)
+            counts[col] = {int(code): int(k) for code, k in zip(codes, n)}
+    return counts
+
+
+def merge_histograms(reference, counts):
+    """Jumlahkan dua histogram {kolom: {kode: jumlah}}, mis. referensi lama + baris latih baru."""
+    merged = {col: dict(bins) for col, bins in reference.items()}
+    for col, bins in counts.items():
+        target = merged.setdefault(col, {})
+        for code, n in bins.items():
+            target[code] = target.get(code, 0) + n
+    return merged
+
+
+def save_reference_histograms(counts, path=DRIFT_REFERENCE_PATH):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({col: {str(code): n for code, n in sorted(bins.items())} for col, bins in counts.items()}, f, indent=2)
+
+
+def load_reference_histograms(path=DRIFT_REFERENCE_PATH):
+    with open(path, encoding='utf-8') as f:
+        return {col: {int(code): n for code, n in bins.items()} for col, bins in json.load(f).items()}
+
+
+def psi(expected, actual, epsilon=PSI_EPSILON):
+    """Population Stability Index antara dua vektor frekuensi dengan bin yang sama."""
+    expected = np.maximum(expected / max(expected.sum(), 1), epsilon)
+    actual = np.maximum(actual / max(actual.sum(), 1), epsilon)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class DriftMonitor:
+    """Statistik streaming input prediksi dibandingkan dengan distribusi training, memori konstan.
+
+    Per fitur disimpan mean/M2 (Welford, digabung per blok dengan rumus Chan); untuk kolom kode
+    kategori disimpan histogram dengan bin tetap = kode yang ada di data latih + satu bin "lainnya".
+    Referensi numerik diambil dari scaler.mean_/var_, referensi kategori dari `reference_counts`.
+    """
+
+    def __init__(self, scaler, reference_counts, psi_threshold=PSI_THRESHOLD,
+                 shift_threshold=SHIFT_THRESHOLD, min_count=MIN_COUNT):
+        self.feature_names = [str(name) for name in scaler.feature_names_in_]
+        self.reference_mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.reference_std = np.sqrt(np.asarray(scaler.var_, dtype=np.float64))
+        self.psi_threshold = psi_threshold
+        self.shift_threshold = shift_threshold
+        self.min_count = min_count
+
+        self.categorical = [col for col in reference_counts if col in self.feature_names]
+        self._categorical_index = np.array([self.feature_names.index(col) for col in self.categorical], dtype=np.intp)
+        self._bins = {col: sorted(reference_counts[col]) for col in self.categorical}
+        # Semua bin kategori disusun dalam satu array kunci terurut agar satu searchsorted cukup per batch
+        keys, expected, offsets = [], [], [0]
+        for i, col in enumerate(self.categorical):
+            keys.extend(i * KEY_STRIDE + code for code in self._bins[col])
+            expected.extend(reference_counts[col][code] for code in self._bins[col])
+            offsets.append(len(keys))
+        self._keys = np.asarray(keys, dtype=np.int64)
+        self._expected = np.asarray(expected, dtype=np.float64)
+        self._offsets = offsets
+        self._other_base = len(keys)
+        self._column_offsets = np.arange(len(self.categorical), dtype=np.int64) * KEY_STRIDE
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_reference(cls, scaler, path=DRIFT_REFERENCE_PATH, **kwargs):
+        """Monitor dengan histogram referensi yang ditulis bersama artefak model (tanpa membaca data.csv)."""
+        return cls(scaler, load_reference_histograms(path), **kwargs)
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self._mean = np.zeros(len(self.feature_names))
+            self._m2 = np.zeros(len(self.feature_names))
+            self._counts = np.zeros(self._other_base + len(self.categorical), dtype=np.int64)
+            self._buffer = np.empty((BUFFER_ROWS, len(self.feature_names)))
+            self._buffered = 0
+            self.started_at = time.time()
+
+    def update(self, features):
+        """Tambahkan satu vektor atau matriks fitur (urutan scaler.feature_names_in_).
+
+        Baris tunggal hanya disalin ke buffer berukuran tetap; statistik dilipat per BUFFER_ROWS
+        baris sehingga biaya per permintaan interaktif hanya satu salinan array.
+        """
+        X = np.asarray(features, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n = len(X)
+        with self._lock:
+            if self._buffered + n <= BUFFER_ROWS:
+                self._buffer[self._buffered:self._buffered + n] = X
+                self._buffered += n
+                if self._buffered == BUFFER_ROWS:
+                    self._flush()
+            else:
+                self._flush()
+                self._fold(X)
+
+    def _flush(self):
+        if self._buffered:
+            self._fold(self._buffer[:self._buffered])
+            self._buffered = 0
+
+    def _fold(self, X):
+        n = len(X)
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+
+        keys = X[:, self._categorical_index].astype(np.int64) + self._column_offsets
+        position = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+        bins = np.where(self._keys[position] == keys, position, self._other_base + np.arange(len(self.categorical)))
+
+        total = self.count + n
+        delta = batch_mean - self._mean
+        self._mean += delta * (n / total)
+        self._m2 += batch_m2 + delta ** 2 * (self.count * n / total)
+        self.count = total
+        self._counts += np.bincount(bins.ravel(), minlength=len(self._counts))
+
+    def snapshot(self):
+        """Ringkasan drift per fitur dan daftar alert, siap diserialisasi ke JSON."""
+        with self._lock:
+            self._flush()
+            count = self.count
+            mean = self._mean.copy()
+            var = self._m2 / count if count else np.zeros_like(self._m2)
+            counts = self._counts.copy()
+
+        std = np.where(self.reference_std > 0, self.reference_std, 1.0)
+        shift = (mean - self.reference_mean) / std
+        var_ratio = var / np.where(self.reference_std > 0, self.reference_std ** 2, 1.0)
+        ready = count >= self.min_count
+
+        features, alerts = {}, []
+        for i, name in enumerate(self.feature_names):
+            features[name] = {
+                'mean': float(mean[i]),
+                'reference_mean': float(self.reference_mean[i]),
+                'standardized_shift': float(shift[i]),
+                'variance_ratio': float(var_ratio[i]),
+            }
+            if ready and name not in self.categorical and abs(shift[i]) > self.shift_threshold:
+                alerts.append({'feature': name, 'metric': 'standardized_shift', 'value': float(shift[i])})
+
+        for j, col in enumerate(self.categorical):
+            start, end = self._offsets[j], self._offsets[j + 1]
+            actual = np.append(counts[start:end], counts[self._other_base + j]).astype(np.float64)
+            expected = np.append(self._expected[start:end], 0.0)
+            value = psi(expected, actual) if count else 0.0
+            features[col]['psi'] = value
+            features[col]['unseen_codes'] = int(counts[self._other_base + j])
+            if ready and value > self.psi_threshold:
+                alerts.append({'feature': col, 'metric': 'psi', 'value': value})
+
+        return {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'since': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'count': count,
+            'thresholds': {'psi': self.psi_threshold, 'standardized_shift': self.shift_threshold,
+                           'min_count': self.min_count},
+            'alerts': alerts,
+            'features': features,
+        }
+
+    def write_snapshot(self, path):
+        """Tulis snapshot JSON secara atomik."""
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def load_drift_monitor(scaler, path=DRIFT_REFERENCE_PATH, **kwargs):
+    """DriftMonitor dari referensi hasil export; None jika file belum ada atau tidak terbaca."""
+    try:
+        return DriftMonitor.from_reference(scaler, path, **kwargs)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan drift input sebuah file CSV terhadap distribusi training.")
+    parser.add_argument('input', help="File CSV (separator ';', format data.csv)")
+    parser.add_argument('--output', help="File JSON snapshot (bawaan: stdout)")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    from artifacts import load_feature_pipeline, load_native_artifacts
+
+    _, scaler, _ = load_native_artifacts()
+    if scaler is None:
+        print("Artefak native belum ada; jalankan export_artifacts.py terlebih dahulu", file=sys.stderr)
+        return 1
+    monitor = load_drift_monitor(scaler)
+    if monitor is None:
+        print(f"Referensi drift {DRIFT_REFERENCE_PATH} belum ada; jalankan export_artifacts.py", file=sys.stderr)
+        return 1
+    pipeline = load_feature_pipeline()
+    for chunk in pd.read_csv(args.input, sep=';', chunksize=5000):
+        monitor.update(pipeline.transform(chunk))
+
+    snapshot = monitor.snapshot()
+    if args.output:
+        monitor.write_snapshot(args.output)
+    else:
+        print(json.dumps(snapshot, indent=2))
+    return 1 if snapshot['alerts'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import numpy as np
+
+DEFAULT_TOP_K = 8
+CONTRIB_PREFIX = 'contrib_'
+
+
+def top_contributions(feature_names, contribs, k=DEFAULT_TOP_K):
+    """Pasangan (nama fitur, kontribusi) satu baris, diurutkan menurut besar pengaruhnya."""
+    order = np.argsort(-np.abs(contribs))[:k]
+    return [(feature_names[i], float(contribs[i])) for i in order]
+
+
+def contribution_columns(feature_names, contribs):
+    """Kolom `contrib_<fitur>` untuk ditambahkan ke hasil batch scoring."""
+    return {CONTRIB_PREFIX + name: contribs[:, i] for i, name in enumerate(feature_names)}
+
+
+class Explainer:
+    """Kontribusi per fitur (log-odds) TreeSHAP eksak dari `pred_contribs` native XGBoost, dihitung per batch.
+
+    Menerima matriks fitur mentah dari FeaturePipeline; scaler diterapkan di sini karena
+    booster dilatih pada fitur yang sudah dinormalisasi. Jumlah kontribusi + bias sama
+    dengan margin model, sehingga tidak ada sampling seperti pada explainer model-agnostik.
+    Atribusi per jalur (approx) dihitung langsung oleh CompiledPredictor.contributions.
+    """
+
+    def __init__(self, booster, scaler):
+        self.booster = booster
+        self.scaler = scaler
+        self.feature_names = [str(name) for name in scaler.feature_names_in_]
+
+    def contributions(self, features):
+        """Kembalikan (kontribusi [n, fitur], bias [n]) untuk matriks fitur mentah."""
+        import pandas as pd
+        import xgboost as xgb
+
+        # DataFrame tanpa salinan agar StandardScaler sklearn mengenali nama fiturnya
+        frame = pd.DataFrame(np.atleast_2d(features), columns=self.feature_names, copy=False)
+        X = self.scaler.transform(frame)
+        contribs = self.booster.predict(xgb.DMatrix(X), pred_contribs=True, validate_features=False)
+        return contribs[:, :-1], contribs[:, -1]
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+from artifacts import (
+    COMPILED_MODEL_PATH,
+    DATA_PATH,
+    DRIFT_REFERENCE_PATH,
+    ENCODERS_JSON_PATH,
+    FEATURE_PIPELINE_PATH,
+    MANIFEST_PATH,
+    NATIVE_MODEL_PATH,
+    SCALER_NPZ_PATH,
+    load_artifacts,
+    load_feature_pipeline,
+    pickle_digest,
+)
+from compiled_predictor import CompiledPredictor
+from drift_monitor import reference_histograms, save_reference_histograms
+from feature_pipeline import FeaturePipeline
+
+
+def load_training_features(path=DATA_PATH):
+    """Matriks fitur mentah data.csv melalui pipeline yang disimpan bersama model."""
+    import pandas as pd
+
+    data = pd.read_csv(path, sep=';')
+    return load_feature_pipeline().transform(data.drop(columns=['Status'], errors='ignore'))
+
+
+def export_artifacts(model, scaler, label_encoders):
+    """Konversi artefak pickle ke format native yang bisa dimuat tanpa sklearn."""
+    # Booster dalam format UBJSON native XGBoost
+    model.get_booster().save_model(NATIVE_MODEL_PATH)
+
+    # Pipeline fitur lama (tanpa kategori teks) untuk artefak yang dilatih sebelum feature_pipeline.py
+    if not os.path.exists(FEATURE_PIPELINE_PATH):
+        FeaturePipeline(feature_names=scaler.feature_names_in_).save(FEATURE_PIPELINE_PATH)
+
+    # Pohon yang sudah dikompilasi (scaler dilipat ke threshold) untuk jalur serving, beserta
+    # rata-rata kontribusi data latih sebagai pembanding panel penjelasan
+    predictor = CompiledPredictor.from_model(model, scaler)
+    if os.path.exists(DATA_PATH):
+        predictor.fit_reference(load_training_features())
+    predictor.save(COMPILED_MODEL_PATH)
+
+    np.savez(
+        SCALER_NPZ_PATH,
+        feature_names=np.asarray(scaler.feature_names_in_, dtype=str),
+        mean=scaler.mean_,
+        scale=scaler.scale_,
+        var=scaler.var_,
+    )
+
+    with open(ENCODERS_JSON_PATH, 'w', encoding='utf-8') as f:
+        json.dump({col: [str(c) for c in le.classes_] for col, le in label_encoders.items()}, f, indent=2)
+
+    # Referensi drift untuk artefak yang dilatih sebelum train.py menulisnya; train.py dan
+    # incremental_train.py memperbarui file ini bersama scaler
+    if not os.path.exists(DRIFT_REFERENCE_PATH) and os.path.exists(DATA_PATH):
+        save_reference_histograms(reference_histograms(DATA_PATH), DRIFT_REFERENCE_PATH)
+
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'source_digest': pickle_digest()}, f, indent=2)
+
+    return [NATIVE_MODEL_PATH, COMPILED_MODEL_PATH, SCALER_NPZ_PATH, ENCODERS_JSON_PATH,
+            FEATURE_PIPELINE_PATH, DRIFT_REFERENCE_PATH, MANIFEST_PATH]
+
+
+def main():
+    model, scaler, label_encoders = load_artifacts()
+    if model is None:
+        print("Model, scaler atau label encoder tidak dapat dimuat.", file=sys.stderr)
+        return 1
+
+    for path in export_artifacts(model, scaler, label_encoders):
+        print(f"Tersimpan: {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import json
+
+import numpy as np
+
+RAW_COLUMNS = [
+    'Marital_status', 'Application_mode', 'Application_order', 'Course',
+    'Daytime_evening_attendance', 'Previous_qualification', 'Previous_qualification_grade',
+    'Nacionality', 'Mothers_qualification', 'Fathers_qualification',
+    'Mothers_occupation', 'Fathers_occupation', 'Admission_grade', 'Displaced',
+    'Educational_special_needs', 'Debtor', 'Tuition_fees_up_to_date', 'Gender',
+    'Scholarship_holder', 'Age_at_enrollment', 'International',
+    'Curricular_units_1st_sem_credited', 'Curricular_units_1st_sem_enrolled',
+    'Curricular_units_1st_sem_evaluations', 'Curricular_units_1st_sem_approved',
+    'Curricular_units_1st_sem_grade', 'Curricular_units_1st_sem_without_evaluations',
+    'Curricular_units_2nd_sem_credited', 'Curricular_units_2nd_sem_enrolled',
+    'Curricular_units_2nd_sem_evaluations', 'Curricular_units_2nd_sem_approved',
+    'Curricular_units_2nd_sem_grade', 'Curricular_units_2nd_sem_without_evaluations',
+    'Unemployment_rate', 'Inflation_rate', 'GDP',
+]
+
+ENGINEERED_COLUMNS = ['avg_grade', 'approval_rate']
+
+# Kolom numerik yang sebenarnya kode kategori (program studi, mode pendaftaran, 0/1, ...)
+CODE_COLUMNS = [
+    'Marital_status', 'Application_mode', 'Course', 'Daytime_evening_attendance', 'Previous_qualification',
+    'Nacionality', 'Mothers_qualification', 'Fathers_qualification', 'Mothers_occupation',
+    'Fathers_occupation', 'Displaced', 'Educational_special_needs', 'Debtor', 'Tuition_fees_up_to_date',
+    'Gender', 'Scholarship_holder', 'International',
+]
+
+
+class FeaturePipeline:
+    """Satu-satunya implementasi pra-pemrosesan untuk training, prediksi interaktif dan batch.
+
+    Urutannya sama dengan notebook: kategori teks di-encode (semantik LabelEncoder),
+    fitur avg_grade/approval_rate dihitung, lalu nilai kosong diisi `fill_value`.
+    Hasilnya matriks dengan urutan kolom `feature_names` (= scaler.feature_names_in_).
+
+    dtype bawaan float64 karena scaler dan model saat ini dilatih dengan float64;
+    membulatkan fitur ke float32 menggeser sebagian nilai melewati threshold split.
+    """
+
+    def __init__(self, feature_names=None, categories=None, fill_value=0.0, dtype='float64'):
+        self.feature_names = list(feature_names) if feature_names is not None else RAW_COLUMNS + ENGINEERED_COLUMNS
+        self.categories = {col: list(classes) for col, classes in (categories or {}).items()}
+        self.fill_value = fill_value
+        self.dtype = np.dtype(dtype)
+        unknown = [col for col in self.feature_names if col not in RAW_COLUMNS and col not in ENGINEERED_COLUMNS]
+        if unknown:
+            raise ValueError(f"Fitur tidak dikenal: {', '.join(unknown)}")
+        self._codes = {col: {c: i for i, c in enumerate(classes)} for col, classes in self.categories.items()}
+        self._raw_index = {col: i for i, col in enumerate(RAW_COLUMNS)}
+        self._out_index = {col: i for i, col in enumerate(self.feature_names)}
+        self._raw_out = [j for j, col in enumerate(self.feature_names) if col in self._raw_index]
+        self._raw_src = [self._raw_index[self.feature_names[j]] for j in self._raw_out]
+
+    @classmethod
+    def fit(cls, data, **kwargs):
+        """Pelajari kategori dari kolom bertipe object (seperti loop LabelEncoder di notebook)."""
+        categories = {
+            col: sorted(str(v) for v in data[col].dropna().unique())
+            for col in RAW_COLUMNS
+            if col in data and data[col].dtype == object
+        }
+        return cls(categories=categories, **kwargs)
+
+    def _column(self, data, col):
+        if isinstance(data, np.ndarray):
+            values = data[:, self._raw_index[col]]
+        else:
+            values = data[col]
+        if col in self._codes:
+            codes = self._codes[col]
+            values = [codes.get(str(v), np.nan) for v in np.atleast_1d(np.asarray(values, dtype=object))]
+        return np.asarray(values, dtype=self.dtype)
+
+    def transform(self, data, out=None):
+        """Ubah batch mentah menjadi matriks fitur (n_baris, n_fitur).
+
+        `data` dapat berupa DataFrame, dict satu record atau dict kolom, list record,
+        atau ndarray 2D dengan urutan RAW_COLUMNS. `out` opsional untuk memakai ulang buffer.
+        """
+        if isinstance(data, list):
+            data = {col: [record[col] for record in data] for col in RAW_COLUMNS}
+        missing = [col for col in RAW_COLUMNS if not isinstance(data, np.ndarray) and col not in data]
+        if missing:
+            raise ValueError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+
+        n_rows = data.shape[0] if isinstance(data, np.ndarray) else np.size(data[RAW_COLUMNS[0]])
+        if out is None:
+            out = np.empty((n_rows, len(self.feature_names)), dtype=self.dtype)
+
+        if isinstance(data, np.ndarray) and not self._codes:
+            # Satu operasi gather untuk semua kolom mentah
+            out[:, self._raw_out] = data[:, self._raw_src]
+        else:
+            for j, k in zip(self._raw_out, self._raw_src):
+                out[:, j] = self._column(data, RAW_COLUMNS[k])
+
+        idx = self._out_index
+        if 'avg_grade' in idx:
+            col = out[:, idx['avg_grade']]
+            np.add(self._column(data, 'Curricular_units_1st_sem_grade'),
+                   self._column(data, 'Curricular_units_2nd_sem_grade'), out=col)
+            col /= 2
+        if 'approval_rate' in idx:
+            col = out[:, idx['approval_rate']]
+            enrolled = self._column(data, 'Curricular_units_1st_sem_enrolled') \
+                + self._column(data, 'Curricular_units_2nd_sem_enrolled') + 1e-5
+            np.add(self._column(data, 'Curricular_units_1st_sem_approved'),
+                   self._column(data, 'Curricular_units_2nd_sem_approved'), out=col)
+            col /= enrolled
+
+        # Sama dengan data.fillna(0) di notebook
+        np.copyto(out, self.fill_value, where=np.isnan(out))
+        return out
+
+    def transform_one(self, record):
+        """Vektor fitur 1D untuk satu record (dict)."""
+        if not self._codes:
+            # Jalur cepat form interaktif: satu baris ndarray, tanpa konversi per kolom
+            missing = [col for col in RAW_COLUMNS if col not in record]
+            if missing:
+                raise ValueError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+            record = np.fromiter((record[col] for col in RAW_COLUMNS), dtype=self.dtype,
+                                 count=len(RAW_COLUMNS)).reshape(1, -1)
+        return self.transform(record)[0]
+
+    def to_dict(self):
+        return {
+            'feature_names': self.feature_names,
+            'categories': self.categories,
+            'fill_value': self.fill_value,
+            'dtype': self.dtype.name,
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls(**json.load(f))
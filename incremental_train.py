@@ -0,0 +1,144 @@
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.model_selection import train_test_split
+
+from artifacts import BASE_DIR, DRIFT_REFERENCE_PATH, load_artifacts, load_feature_pipeline
+from compiled_predictor import raw_threshold
+from drift_monitor import (code_histograms, load_reference_histograms, merge_histograms, reference_histograms,
+                           save_reference_histograms)
+from training_utils import RANDOM_STATE, TEST_SIZE, booster_params, holdout_metrics
+
+DEFAULT_EXTRA_ROUNDS = 20
+
+
+def load_new_rows(path, pipeline):
+    """Baca baris berlabel baru (format data.csv) dan ubah menjadi matriks fitur mentah."""
+    data = pd.read_csv(path, sep=';')
+    if 'Status' not in data.columns:
+        raise ValueError("File data baru harus memiliki kolom Status")
+    y = (data['Status'] == 'Dropout').astype(int).to_numpy()
+    return pipeline.transform(data.drop(columns=['Status'])), y
+
+
+def update_scaler(scaler, X_new):
+    """Perbarui mean/variance scaler secara berjalan hanya dengan baris baru (StandardScaler.partial_fit)."""
+    updated = copy.deepcopy(scaler)
+    updated.partial_fit(pd.DataFrame(X_new, columns=scaler.feature_names_in_))
+    return updated
+
+
+def rescale_booster(booster, old_scaler, new_scaler):
+    """Tulis ulang threshold split ke ruang scaler baru agar pohon lama tetap memisahkan data yang sama.
+
+    Threshold mentah diambil dengan `raw_threshold` (tepat terhadap pembulatan float32 XGBoost),
+    lalu dinormalisasi ulang dengan mean/scale baru.
+    """
+    raw = json.loads(booster.save_raw('json'))
+    old_mean, old_scale = np.asarray(old_scaler.mean_), np.asarray(old_scaler.scale_)
+    new_mean, new_scale = np.asarray(new_scaler.mean_), np.asarray(new_scaler.scale_)
+    for tree in raw['learner']['gradient_booster']['model']['trees']:
+        conditions = tree['split_conditions']
+        for node, (lc, f) in enumerate(zip(tree['left_children'], tree['split_indices'])):
+            if lc == -1:
+                continue
+            threshold = raw_threshold(conditions[node], old_mean[f], old_scale[f])
+            conditions[node] = float(np.float32((threshold - new_mean[f]) / new_scale[f]))
+
+    rescaled = xgb.Booster()
+    rescaled.load_model(bytearray(json.dumps(raw).encode('utf-8')))
+    return rescaled
+
+
+def incremental_update(model, scaler, reference_counts, X_new, y_new, extra_rounds=DEFAULT_EXTRA_ROUNDS,
+                       holdout_fraction=TEST_SIZE):
+    """Lanjutkan boosting dari model lama dengan baris baru saja; kembalikan (model, scaler, referensi drift, laporan).
+
+    Histogram kode referensi drift ditambah baris latih yang sama dengan yang masuk ke scaler.
+    """
+    X_train, X_holdout, y_train, y_holdout = train_test_split(
+        X_new, y_new, test_size=holdout_fraction, random_state=RANDOM_STATE,
+        stratify=y_new if len(np.unique(y_new)) > 1 else None,
+    )
+
+    start = time.perf_counter()
+    new_scaler = update_scaler(scaler, X_train)
+    new_reference = merge_histograms(reference_counts, code_histograms(X_train, scaler.feature_names_in_))
+    booster = rescale_booster(model.get_booster(), scaler, new_scaler)
+    dtrain = xgb.DMatrix(new_scaler.transform(pd.DataFrame(X_train, columns=scaler.feature_names_in_)), y_train)
+    booster = xgb.train(booster_params(model), dtrain, num_boost_round=extra_rounds, xgb_model=booster)
+    seconds = time.perf_counter() - start
+
+    new_model = copy.deepcopy(model)
+    new_model._Booster = booster
+    new_model.n_estimators = booster.num_boosted_rounds()
+
+    def holdout_proba(m, s):
+        return m.predict_proba(s.transform(pd.DataFrame(X_holdout, columns=scaler.feature_names_in_)))[:, 1]
+
+    previous = holdout_metrics(holdout_proba(model, scaler), y_holdout)
+    current = holdout_metrics(holdout_proba(new_model, new_scaler), y_holdout)
+    report = {
+        'new_rows': int(len(X_new)),
+        'train_rows': int(len(X_train)),
+        'holdout_rows': int(len(X_holdout)),
+        'extra_rounds': extra_rounds,
+        'total_rounds': new_model.n_estimators,
+        'samples_seen': int(new_scaler.n_samples_seen_),
+        'seconds': seconds,
+        'holdout': {
+            'previous': previous,
+            'updated': current,
+            'accuracy_delta': current['accuracy'] - previous['accuracy'],
+        },
+    }
+    return new_model, new_scaler, new_reference, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Perbarui model dropout secara inkremental dari baris berlabel baru (tanpa melatih ulang penuh)."
+    )
+    parser.add_argument('new_data', help="File CSV baris baru (separator ';', format data.csv dengan kolom Status)")
+    parser.add_argument('--output-dir', default=BASE_DIR, help="Direktori tujuan bundle artefak baru")
+    parser.add_argument('--rounds', type=int, default=DEFAULT_EXTRA_ROUNDS, help="Jumlah ronde boosting tambahan")
+    parser.add_argument('--holdout', type=float, default=TEST_SIZE,
+                        help="Porsi baris baru untuk perbandingan hold-out")
+    parser.add_argument('--only-if-better', action='store_true',
+                        help="Jangan tulis bundle jika akurasi hold-out lebih rendah dari model sebelumnya")
+    args = parser.parse_args(argv)
+
+    model, scaler, label_encoders = load_artifacts()
+    if model is None:
+        print("Model, scaler atau label encoder tidak dapat dimuat.", file=sys.stderr)
+        return 1
+
+    pipeline = load_feature_pipeline()
+    X_new, y_new = load_new_rows(args.new_data, pipeline)
+    # Artefak lama tanpa drift_reference.json: referensi awal dihitung dari data.csv
+    reference = (load_reference_histograms() if os.path.exists(DRIFT_REFERENCE_PATH) else reference_histograms())
+    new_model, new_scaler, new_reference, report = incremental_update(model, scaler, reference, X_new, y_new,
+                                                                      args.rounds, args.holdout)
+
+    report['written'] = not (args.only_if_better and report['holdout']['accuracy_delta'] < 0)
+    if report['written']:
+        os.makedirs(args.output_dir, exist_ok=True)
+        joblib.dump(new_model, os.path.join(args.output_dir, 'model_dropout_xgboost.pkl'))
+        joblib.dump(new_scaler, os.path.join(args.output_dir, 'scaler.pkl'))
+        joblib.dump(label_encoders, os.path.join(args.output_dir, 'label_encoders.pkl'))
+        pipeline.save(os.path.join(args.output_dir, 'feature_pipeline.json'))
+        save_reference_histograms(new_reference, os.path.join(args.output_dir, 'drift_reference.json'))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
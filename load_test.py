@@ -0,0 +1,62 @@
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from artifacts import DATA_PATH
+from feature_pipeline import RAW_COLUMNS
+
+
+def load_records(path, limit=None):
+    data = pd.read_csv(path, sep=';', nrows=limit)
+    return data[RAW_COLUMNS].to_dict(orient='records')
+
+
+def send(url, record):
+    body = json.dumps(record).encode('utf-8')
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run(url, records, total, concurrency):
+    """Kirim total permintaan (satu record per permintaan) secara paralel dan kumpulkan latensinya."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(lambda i: send(url, records[i % len(records)]), range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': total,
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'requests_per_sec': total / elapsed,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator beban lokal untuk scoring_server.py menggunakan baris data.csv.")
+    parser.add_argument('--url', default='http://127.0.0.1:8000/predict')
+    parser.add_argument('--data', default=DATA_PATH)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args(argv)
+
+    summary = run(args.url, load_records(args.data), args.requests, args.concurrency)
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
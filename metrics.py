@@ -0,0 +1,162 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Batas bucket histogram (detik), dari 10 mikrodetik sampai 10 detik
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+STAGE_METRIC = 'stage_duration_seconds'
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Perkiraan kuantil: batas atas bucket tempat kuantil berada."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += n
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+class Metrics:
+    """Registry histogram dan counter per proses; ringan (satu lock + bisect per observasi)."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._counters = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(STAGE_METRIC, time.perf_counter() - start, stage=stage)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def register_collector(self, collector):
+        """collector() mengembalikan dict {nama_metrik: nilai} yang diekspor sebagai gauge."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def stage_summary(self):
+        """Ringkasan per tahap untuk panel diagnostik: jumlah, rata-rata, p50 dan p95 (ms)."""
+        with self._lock:
+            rows = []
+            for (name, labels), h in sorted(self._histograms.items()):
+                if name != STAGE_METRIC:
+                    continue
+                rows.append({
+                    'stage': dict(labels).get('stage'),
+                    'count': h.count,
+                    'mean_ms': h.sum / h.count * 1000 if h.count else 0.0,
+                    'p50_ms': h.quantile(0.5) * 1000,
+                    'p95_ms': h.quantile(0.95) * 1000,
+                })
+            return rows
+
+    def counters(self):
+        with self._lock:
+            return {name + _format_labels(labels): value for (name, labels), value in sorted(self._counters.items())}
+
+    def render_prometheus(self):
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), h in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f'# TYPE {name} histogram')
+                    typed.add(name)
+                cumulative = 0
+                for bound, n in zip(h.buckets, h.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", repr(bound)),))} {cumulative}')
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {h.count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {h.sum}')
+                lines.append(f'{name}_count{_format_labels(labels)} {h.count}')
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f'# TYPE {name} counter')
+                    typed.add(name)
+                lines.append(f'{name}{_format_labels(labels)} {value}')
+            collectors = list(self._collectors)
+        for collector in collectors:
+            for name, value in collector().items():
+                lines.append(f'# TYPE {name} gauge')
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Tulis snapshot format teks Prometheus secara atomik (untuk textfile collector)."""
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+
+REGISTRY = Metrics()
+
+
+def start_http_server(port, host='127.0.0.1', registry=REGISTRY):
+    """Layani GET /metrics di thread latar; kembalikan objek server."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-exporter', daemon=True).start()
+    return server
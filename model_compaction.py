@@ -0,0 +1,209 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from artifacts import (COMPACT_MANIFEST_PATH, COMPACT_MODEL_PATH, DATA_PATH, load_artifacts, load_feature_pipeline,
+                       pickle_digest)
+from compiled_predictor import CompiledPredictor
+from training_utils import booster_params, holdout_metrics, holdout_split
+
+# Porsi ronde boosting yang dipertahankan untuk varian potong
+ROUND_FRACTIONS = (0.25, 0.5, 0.75)
+# Split dengan gain di bawah persentil ini (dari seluruh split model) dipangkas
+GAIN_PERCENTILES = (25, 50)
+# Kedalaman ensemble murid untuk distilasi; dibatasi di bawah kedalaman model guru
+DISTILL_DEPTHS = (1, 2, 3)
+DEFAULT_TOLERANCE = 0.01
+LATENCY_SAMPLES = 1000
+LATENCY_REPEATS = 5
+
+
+def load_split(scaler, path=DATA_PATH):
+    """(X_train, X_test, y_train, y_test) mentah dari data.csv dengan pembagian yang sama seperti train.py."""
+    data = pd.read_csv(path, sep=';')
+    y = (data['Status'] == 'Dropout').astype(int).to_numpy()
+    X = load_feature_pipeline().transform(data.drop(columns=['Status']))
+    return holdout_split(X, y)
+
+
+def _scaled(scaler, X):
+    return scaler.transform(pd.DataFrame(X, columns=scaler.feature_names_in_))
+
+
+def split_gains(booster):
+    """Gain (loss_changes) semua split internal pada booster."""
+    trees = json.loads(booster.save_raw('json'))['learner']['gradient_booster']['model']['trees']
+    return np.array([gain for tree in trees
+                     for gain, lc in zip(tree['loss_changes'], tree['left_children']) if lc != -1])
+
+
+def truncate_rounds(booster, rounds):
+    """Pertahankan `rounds` ronde boosting pertama."""
+    return booster[:rounds]
+
+
+def prune_low_gain(booster, dtrain, min_gain):
+    """Pangkas split dengan gain < `min_gain` dari bawah ke atas (updater prune XGBoost)."""
+    params = {'process_type': 'update', 'updater': 'prune', 'gamma': min_gain, 'objective': 'binary:logistic'}
+    return xgb.train(params, dtrain, num_boost_round=booster.num_boosted_rounds(), xgb_model=booster)
+
+
+def distill(params, X_train, teacher_probability, max_depth, rounds):
+    """Latih ensemble yang lebih dangkal pada probabilitas model guru (label lunak)."""
+    params = {**params, 'max_depth': max_depth}
+    return xgb.train(params, xgb.DMatrix(X_train, teacher_probability), num_boost_round=rounds)
+
+
+def build_variants(model, X_train, y_train, teacher_probability):
+    """Kembalikan {nama: (metode, booster)} untuk semua varian ringkas dari satu model guru."""
+    booster = model.get_booster()
+    rounds = booster.num_boosted_rounds()
+    dtrain = xgb.DMatrix(X_train, y_train)
+    params = booster_params(model)
+    depth = params.get('max_depth') or 6
+
+    variants = {}
+    for fraction in ROUND_FRACTIONS:
+        kept = max(1, int(rounds * fraction))
+        variants[f'truncate_{kept}'] = ('truncate', truncate_rounds(booster, kept))
+    gains = split_gains(booster)
+    for percentile in GAIN_PERCENTILES:
+        min_gain = float(np.percentile(gains, percentile))
+        variants[f'prune_p{percentile}'] = ('prune', prune_low_gain(booster, dtrain, min_gain))
+    for max_depth in DISTILL_DEPTHS:
+        if max_depth < depth:
+            variants[f'distill_d{max_depth}'] = ('distill', distill(params, X_train, teacher_probability,
+                                                                    max_depth, rounds))
+    return variants
+
+
+def measure(booster, scaler, X_test, y_test, samples=LATENCY_SAMPLES):
+    """Ukuran file, latensi jalur serving (CompiledPredictor) dan metrik hold-out satu booster."""
+    predictor = CompiledPredictor.from_model(booster, scaler)
+    with tempfile.TemporaryDirectory() as tmp:
+        npz_path, ubj_path = os.path.join(tmp, 'model.npz'), os.path.join(tmp, 'model.ubj')
+        predictor.save(npz_path)
+        booster.save_model(ubj_path)
+        sizes = {'npz_bytes': os.path.getsize(npz_path), 'ubj_bytes': os.path.getsize(ubj_path)}
+
+    # Rata-rata per panggilan predict_one, ambil pengulangan tercepat (gaya timeit) agar noise CPU tidak dominan
+    rows = X_test[np.arange(samples) % len(X_test)]
+    per_call = []
+    for _ in range(LATENCY_REPEATS):
+        start = time.perf_counter()
+        for x in rows:
+            predictor.predict_one(x)
+        per_call.append((time.perf_counter() - start) / samples)
+    start = time.perf_counter()
+    probability = predictor.predict_proba(X_test)
+    batch_seconds = time.perf_counter() - start
+
+    nodes = int(np.sum(predictor.left != np.arange(len(predictor.left))))
+    return predictor, {
+        'trees': int(len(predictor.roots)),
+        'splits': nodes,
+        'max_depth': int(predictor.max_depth),
+        **sizes,
+        'latency_us': min(per_call) * 1e6,
+        'batch_ms': batch_seconds * 1000,
+        **holdout_metrics(probability, y_test),
+    }
+
+
+def compact(model, scaler, tolerance=DEFAULT_TOLERANCE):
+    """Bangun dan ukur semua varian; kembalikan (laporan, {nama: predictor})."""
+    X_train, X_test, y_train, y_test = load_split(scaler)
+    X_train_scaled = _scaled(scaler, X_train)
+    teacher_probability = model.get_booster().predict(xgb.DMatrix(X_train_scaled))
+
+    _, teacher = measure(model.get_booster(), scaler, X_test, y_test)
+    predictors, variants = {}, []
+    X_all = np.vstack([X_train, X_test])
+    for name, (method, booster) in build_variants(model, X_train_scaled, y_train, teacher_probability).items():
+        predictors[name], metrics = measure(booster, scaler, X_test, y_test)
+        predictors[name].fit_reference(X_all)
+        metrics.update(
+            name=name,
+            method=method,
+            accuracy_delta=metrics['accuracy'] - teacher['accuracy'],
+            auc_delta=metrics['auc'] - teacher['auc'],
+        )
+        metrics['within_tolerance'] = metrics['accuracy_delta'] >= -tolerance
+        variants.append(metrics)
+
+    # Pilih varian tercepat (lalu terkecil) yang masih dalam toleransi akurasi
+    candidates = [v for v in variants if v['within_tolerance']]
+    selected = min(candidates, key=lambda v: (v['latency_us'], v['npz_bytes'])) if candidates else None
+    report = {
+        'tolerance': tolerance,
+        'test_rows': int(len(y_test)),
+        'teacher': teacher,
+        'variants': variants,
+        'selected': selected['name'] if selected else None,
+    }
+    return report, predictors
+
+
+def install(report, predictors, name):
+    """Tulis varian sebagai model_compact.npz beserta manifest metrik untuk load_bundle()."""
+    variant = next(v for v in report['variants'] if v['name'] == name)
+    predictors[name].save(COMPACT_MODEL_PATH)
+    manifest = {
+        'source_digest': pickle_digest(),
+        'variant': name,
+        'method': variant['method'],
+        'accuracy': variant['accuracy'],
+        'auc': variant['auc'],
+        'teacher_accuracy': report['teacher']['accuracy'],
+        'teacher_auc': report['teacher']['auc'],
+        'accuracy_delta': variant['accuracy_delta'],
+        'auc_delta': variant['auc_delta'],
+    }
+    with open(COMPACT_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return [COMPACT_MODEL_PATH, COMPACT_MANIFEST_PATH]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Buat varian ringkas model dropout (potong ronde, pangkas split, distilasi) dan bandingkan."
+    )
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Penurunan akurasi hold-out maksimum dibanding model asli")
+    parser.add_argument('--install', nargs='?', const='selected', metavar='VARIANT',
+                        help="Pasang varian (bawaan: tercepat dalam toleransi) sebagai model_compact.npz")
+    parser.add_argument('--output', help="File JSON laporan (bawaan: stdout)")
+    args = parser.parse_args(argv)
+
+    model, scaler, _ = load_artifacts()
+    if model is None:
+        print("Model, scaler atau label encoder tidak dapat dimuat.", file=sys.stderr)
+        return 1
+
+    report, predictors = compact(model, scaler, args.tolerance)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.install:
+        name = report['selected'] if args.install == 'selected' else args.install
+        if name not in predictors:
+            print("Tidak ada varian dalam toleransi akurasi" if name is None else f"Varian tidak dikenal: {name}",
+                  file=sys.stderr)
+            return 1
+        for path in install(report, predictors, name):
+            print(f"Tersimpan: {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
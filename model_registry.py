@@ -0,0 +1,203 @@
+import csv
+import hashlib
+import itertools
+import os
+import threading
+import time
+
+import numpy as np
+
+from artifacts import (COMPACT_MODEL_PATH, COMPILED_MODEL_PATH, DATA_PATH, DRIFT_REFERENCE_PATH, FEATURE_PIPELINE_PATH,
+                       MODEL_PATH, artifact_signature, load_artifacts, load_compact_predictor, load_feature_pipeline,
+                       load_native_artifacts, pickle_digest)
+from compiled_predictor import CompiledPredictor
+from drift_monitor import load_drift_monitor
+from feature_pipeline import RAW_COLUMNS
+from metrics import REGISTRY
+
+DEFAULT_POLL_SECONDS = 5.0
+VALIDATION_ROWS = 500
+# Akurasi minimum pada sampel data.csv agar bundle baru boleh dipakai
+MIN_VALIDATION_ACCURACY = 0.75
+MAX_HISTORY = 20
+
+
+class ModelBundle:
+    """Satu versi artefak yang siap dipakai: predictor, scaler, label encoder dan pipeline fitur."""
+
+    def __init__(self, version, predictor, scaler, label_encoders, pipeline, source, signature, drift_monitor=None):
+        self.version = version
+        self.predictor = predictor
+        self.scaler = scaler
+        self.label_encoders = label_encoders
+        self.pipeline = pipeline
+        self.source = source
+        self.signature = signature
+        # Dibuat saat bundle dimuat (thread registry), bukan di jalur permintaan
+        self.drift_monitor = drift_monitor
+        self.loaded_at = time.time()
+
+
+def bundle_version(paths=()):
+    """Versi = 12 karakter pertama SHA-256 atas model, pipeline fitur, referensi drift dan file tambahan `paths`.
+
+    Model diwakili source_digest pickle (atau isi model_compiled.npz jika pickle tidak ada).
+    Pipeline dan referensi drift ikut di-hash agar perubahan file tersebut tanpa retrain tetap menjadi versi baru.
+    """
+    digest = hashlib.sha256()
+    if os.path.exists(MODEL_PATH):
+        digest.update(pickle_digest().encode())
+    else:
+        with open(COMPILED_MODEL_PATH, 'rb') as f:
+            digest.update(f.read())
+    for path in (FEATURE_PIPELINE_PATH, DRIFT_REFERENCE_PATH, *paths):
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def load_bundle(compact_tolerance=None):
+    """Muat bundle dari disk (native dulu, fallback pickle); kembalikan None jika gagal.
+
+    Jika `compact_tolerance` diisi, varian ringkas dari model_compaction.py dipakai selama
+    penurunan akurasi hold-out-nya tidak melebihi toleransi tersebut.
+    """
+    signature = artifact_signature()
+    with REGISTRY.time('load_models'):
+        source = 'native'
+        predictor, scaler, label_encoders = load_native_artifacts()
+        if predictor is None:
+            source = 'pickle'
+            model, scaler, label_encoders = load_artifacts()
+            predictor = CompiledPredictor.from_model(model, scaler) if model and scaler else None
+        version = bundle_version() if predictor is not None else None
+        if predictor is not None and compact_tolerance is not None:
+            compact, manifest = load_compact_predictor(compact_tolerance)
+            if compact is not None:
+                predictor, source = compact, 'compact'
+                version = f"{bundle_version((COMPACT_MODEL_PATH,))}-{manifest['variant']}"
+    REGISTRY.inc('model_loads_total', source=source if predictor else 'failed')
+    if predictor is None or not label_encoders:
+        return None
+    return ModelBundle(version, predictor, scaler, label_encoders, load_feature_pipeline(), source, signature,
+                       load_drift_monitor(scaler))
+
+
+def validate_bundle(bundle, path=DATA_PATH, rows=VALIDATION_ROWS, min_accuracy=MIN_VALIDATION_ACCURACY):
+    """Prediksi sampel dari data.csv; raise ValueError jika hasilnya tidak masuk akal.
+
+    Dibaca dengan modul csv agar startup jalur native tidak perlu mengimpor pandas.
+    FileNotFoundError jika file sampel tidak ada (lihat ModelRegistry.reload).
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        sample = list(itertools.islice(csv.DictReader(f, delimiter=';'), rows))
+    matrix = np.array([[float(record[col]) for col in RAW_COLUMNS] for record in sample])
+    status = np.array([record['Status'] == 'Dropout' for record in sample])
+    probability = bundle.predictor.predict_proba(bundle.pipeline.transform(matrix))
+    if probability.shape != (len(sample),) or not np.all(np.isfinite(probability)):
+        raise ValueError("Prediksi sampel tidak valid")
+    if probability.min() < 0 or probability.max() > 1:
+        raise ValueError("Probabilitas sampel di luar rentang [0, 1]")
+    accuracy = float(np.mean((probability > 0.5) == status))
+    if accuracy < min_accuracy:
+        raise ValueError(f"Akurasi sampel {accuracy:.3f} di bawah batas {min_accuracy:.3f}")
+    return accuracy
+
+
+class ModelRegistry:
+    """Registry versi model dengan pemuatan di thread latar dan hot-swap atomik.
+
+    Thread pengawas memeriksa artifact_signature() setiap `poll_seconds`. Bundle baru dimuat
+    dan divalidasi di latar, lalu referensi `current()` diganti sekaligus: permintaan yang
+    sudah memegang bundle lama tetap selesai dengan versi tersebut.
+    """
+
+    def __init__(self, poll_seconds=DEFAULT_POLL_SECONDS, loader=load_bundle, validator=validate_bundle):
+        self.poll_seconds = poll_seconds
+        self.loader = loader
+        self.validator = validator
+        self.history = []
+        self._current = None
+        self._pending_signature = None
+        self._rejected_signature = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def current(self):
+        """Bundle aktif; simpan hasilnya di variabel lokal selama satu permintaan."""
+        return self._current
+
+    def _record(self, version, status, **extra):
+        entry = {'version': version, 'status': status, 'at': time.strftime('%Y-%m-%d %H:%M:%S'), **extra}
+        self.history.append(entry)
+        del self.history[:-MAX_HISTORY]
+
+    def reload(self):
+        """Muat dan validasi artefak di disk; tukar jika valid. Kembalikan True jika versi berganti."""
+        with self._lock:
+            signature = artifact_signature()
+            bundle = self.loader()
+            if bundle is None:
+                REGISTRY.inc('model_validation_failures_total')
+                self._rejected_signature = signature
+                self._record(None, 'gagal dimuat')
+                return False
+            current = self._current
+            if current is not None and bundle.version == current.version:
+                current.signature = bundle.signature
+                return False
+            # File berubah lagi selama dimuat (mis. retrain masih menulis); coba lagi di polling berikutnya
+            if artifact_signature() != bundle.signature:
+                return False
+            try:
+                accuracy = self.validator(bundle)
+            except FileNotFoundError as e:
+                # Sampel validasi (data.csv) tidak ikut di-deploy: versi awal tetap dilayani tanpa
+                # validasi, tetapi pergantian versi hanya boleh lewat validasi
+                if current is not None:
+                    REGISTRY.inc('model_validation_failures_total')
+                    self._rejected_signature = bundle.signature
+                    self._record(bundle.version, 'ditolak', error=str(e))
+                    return False
+                self._current = bundle
+                REGISTRY.inc('model_swaps_total')
+                self._record(bundle.version, 'tidak divalidasi', source=bundle.source, error=str(e))
+                return True
+            except Exception as e:
+                REGISTRY.inc('model_validation_failures_total')
+                self._rejected_signature = bundle.signature
+                self._record(bundle.version, 'ditolak', error=str(e))
+                return False
+            self._current = bundle
+            REGISTRY.inc('model_swaps_total')
+            self._record(bundle.version, 'aktif', source=bundle.source, validation_accuracy=accuracy)
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            current = self._current
+            signature = artifact_signature()
+            if signature == self._rejected_signature or (current is not None and signature == current.signature):
+                self._pending_signature = None
+                continue
+            # Tunggu satu polling lagi sampai file berhenti berubah sebelum memuat
+            if signature != self._pending_signature:
+                self._pending_signature = signature
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                self._record(None, 'gagal dimuat', error=str(e))
+
+    def start(self):
+        """Muat versi awal secara sinkron lalu jalankan thread pengawas."""
+        self.reload()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='model-registry', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -0,0 +1,201 @@
+import json
+import os
+
+from artifacts import ENCODERS_JSON_PATH
+
+# Katalog pilihan form (label -> kode data.csv). Modul diimpor sekali per proses, sehingga
+# rerun Streamlit tidak lagi membangun ulang dict ini; validasi input di scoring_server
+# memakai katalog yang sama.
+
+MARITAL_STATUS = {
+    "1 - Single": 1,
+    "2 - Married": 2,
+    "3 - Widower": 3,
+    "4 - Divorced": 4,
+    "5 - Facto union": 5,
+    "6 - Legally separated": 6,
+}
+
+APPLICATION_MODE = {
+    "1 - 1st phase - general contingent": 1,
+    "2 - Ordinance No. 612/93": 2,
+    "5 - 1st phase - special contingent (Azores Island)": 5,
+    "7 - Holders of other higher courses": 7,
+    "10 - Ordinance No. 854-B/99": 10,
+    "15 - International student (bachelor)": 15,
+    "16 - 1st phase - special contingent (Madeira Island)": 16,
+    "17 - 2nd phase - general contingent": 17,
+    "18 - 3rd phase - general contingent": 18,
+    "26 - Ordinance No. 533-A/99, item b2)": 26,
+    "27 - Ordinance No. 533-A/99, item b3": 27,
+    "39 - Over 23 years old": 39,
+    "42 - Transfer": 42,
+    "43 - Change of course": 43,
+    "44 - Technological specialization diploma holders": 44,
+    "51 - Change of institution/course": 51,
+    "53 - Short cycle diploma holders": 53,
+    "57 - Change of institution/course (International)": 57,
+}
+
+COURSE = {
+    "33 - Biofuel Production Technologies": 33,
+    "171 - Animation and Multimedia Design": 171,
+    "8014 - Social Service (evening attendance)": 8014,
+    "9003 - Agronomy": 9003,
+    "9070 - Communication Design": 9070,
+    "9085 - Veterinary Nursing": 9085,
+    "9119 - Informatics Engineering": 9119,
+    "9130 - Equinculture": 9130,
+    "9147 - Management": 9147,
+    "9238 - Social Service": 9238,
+    "9254 - Tourism": 9254,
+    "9500 - Nursing": 9500,
+    "9556 - Oral Hygiene": 9556,
+    "9670 - Advertising and Marketing Management": 9670,
+    "9773 - Journalism and Communication": 9773,
+    "9853 - Basic Education": 9853,
+    "9991 - Management (evening attendance)": 9991,
+}
+
+ATTENDANCE = {
+    "1 - Daytime": 1,
+    "0 - Evening": 0,
+}
+
+PREVIOUS_QUALIFICATION = {
+    "1 - Secondary education": 1,
+    "2 - Higher education - bachelor's degree": 2,
+    "3 - Higher education - degree": 3,
+    "4 - Higher education - master's": 4,
+    "5 - Higher education - doctorate": 5,
+    "6 - Frequency of higher education": 6,
+    "9 - 12th year of schooling - not completed": 9,
+    "10 - 11th year of schooling - not completed": 10,
+    "12 - Other - 11th year of schooling": 12,
+    "14 - 10th year of schooling": 14,
+    "15 - 10th year of schooling - not completed": 15,
+    "19 - Basic education 3rd cycle": 19,
+    "38 - Basic education 2nd cycle": 38,
+    "39 - Technological specialization course": 39,
+    "40 - Higher education - degree (1st cycle)": 40,
+    "42 - Professional higher technical course": 42,
+    "43 - Higher education - master (2nd cycle)": 43,
+}
+
+NATIONALITY = {
+    "1 - Portuguese": 1,
+    "2 - German": 2,
+    "6 - Spanish": 6,
+    "11 - Italian": 11,
+    "13 - Dutch": 13,
+    "14 - English": 14,
+    "17 - Lithuanian": 17,
+    "21 - Angolan": 21,
+    "22 - Cape Verdean": 22,
+    "24 - Guinean": 24,
+    "25 - Mozambican": 25,
+    "26 - Santomean": 26,
+    "32 - Turkish": 32,
+    "41 - Brazilian": 41,
+    "62 - Romanian": 62,
+    "100 - Moldova (Republic of)": 100,
+    "101 - Mexican": 101,
+    "103 - Ukrainian": 103,
+    "105 - Russian": 105,
+    "108 - Cuban": 108,
+    "109 - Colombian": 109,
+}
+
+# Ibu dan ayah memakai daftar yang sama
+PARENT_QUALIFICATION = {
+    "1 - Secondary Education": 1,
+    "2 - Higher Education - Bachelor's Degree": 2,
+    "3 - Higher Education - Degree": 3,
+    "4 - Higher Education - Master's": 4,
+    "5 - Higher Education - Doctorate": 5,
+    "6 - Frequency of Higher Education": 6,
+    "9 - 12th Year of Schooling - Not Completed": 9,
+    "10 - 11th Year of Schooling - Not Completed": 10,
+    "12 - Other - 11th Year of Schooling": 12,
+    "14 - 10th Year of Schooling": 14,
+    "15 - 10th Year of Schooling - Not Completed": 15,
+    "19 - Basic Education 3rd Cycle": 19,
+    "38 - Basic Education 2nd Cycle": 38,
+    "39 - Technological Specialization Course": 39,
+    "40 - Higher Education - Degree (1st Cycle)": 40,
+    "42 - Professional Higher Technical Course": 42,
+    "43 - Higher Education - Master (2nd Cycle)": 43,
+}
+
+PARENT_OCCUPATION = {
+    "0 - Not Available": 0,
+    "1 - Executives and Managers": 1,
+    "2 - Professionals": 2,
+    "3 - Technicians and Associate Professionals": 3,
+    "4 - Administrative Staff": 4,
+    "5 - Personal Services, Protection, Security": 5,
+    "6 - Sellers": 6,
+    "7 - Farmers and Skilled Workers in Agriculture": 7,
+    "8 - Skilled Workers in Industry, Construction, Artisans": 8,
+    "9 - Machine Operators and Assembly Workers": 9,
+    "10 - Unskilled Workers": 10,
+    "90 - Other Situation": 90,
+}
+
+BOOLEAN = {
+    "Tidak": 0,
+    "Ya": 1
+}
+
+GENDER = {
+    "Laki-laki": 1,
+    "Perempuan": 0
+}
+
+# Pilihan per kolom data.csv
+OPTIONS = {
+    'Marital_status': MARITAL_STATUS,
+    'Application_mode': APPLICATION_MODE,
+    'Course': COURSE,
+    'Daytime_evening_attendance': ATTENDANCE,
+    'Previous_qualification': PREVIOUS_QUALIFICATION,
+    'Nacionality': NATIONALITY,
+    'Mothers_qualification': PARENT_QUALIFICATION,
+    'Fathers_qualification': PARENT_QUALIFICATION,
+    'Mothers_occupation': PARENT_OCCUPATION,
+    'Fathers_occupation': PARENT_OCCUPATION,
+    'Displaced': BOOLEAN,
+    'Educational_special_needs': BOOLEAN,
+    'Debtor': BOOLEAN,
+    'Tuition_fees_up_to_date': BOOLEAN,
+    'Gender': GENDER,
+    'Scholarship_holder': BOOLEAN,
+    'International': BOOLEAN,
+}
+
+
+def load_training_codes(path=ENCODERS_JSON_PATH):
+    """Kode yang dikenal label encoder (export label_encoders.pkl); {} jika file belum ada."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        classes = json.load(f)
+    return {col: {int(float(c)) for c in values} for col, values in classes.items() if col in OPTIONS}
+
+
+TRAINING_CODES = load_training_codes()
+# Kode valid = pilihan form + kode yang muncul di data latih
+VALID_CODES = {
+    col: set(options.values()) | TRAINING_CODES.get(col, set())
+    for col, options in OPTIONS.items()
+}
+
+
+def invalid_codes(record):
+    """Daftar kolom kategori yang kodenya tidak ada di katalog maupun data latih."""
+    problems = []
+    for col, codes in VALID_CODES.items():
+        value = record.get(col)
+        if value is not None and float(value) not in codes:
+            problems.append(f"{col}={value}")
+    return problems
@@ -0,0 +1,81 @@
+import pandas as pd
+import streamlit as st
+
+from artifacts import DATA_PATH
+from cohort_cube import DIMENSIONS, CohortCube
+from dataset_cache import file_signature, load_dataset
+from metrics import REGISTRY
+
+st.set_page_config(
+    page_title="Analitik Kohort",
+    page_icon="📊",
+    layout="wide"
+)
+
+DIMENSION_LABELS = {
+    'Course': "Program Studi",
+    'Application_mode': "Mode Pendaftaran",
+    'Scholarship_holder': "Penerima Beasiswa",
+    'Debtor': "Memiliki Tunggakan",
+    'Tuition_fees_up_to_date': "Biaya Kuliah Tepat Waktu",
+    'Gender': "Jenis Kelamin",
+    'Marital_status': "Status Pernikahan",
+    'Daytime_evening_attendance': "Waktu Kehadiran",
+    'Displaced': "Terdampak (Displaced)",
+    'International': "Mahasiswa Internasional",
+}
+
+# Cube dibangun sekali per versi data.csv dan dibagikan ke semua sesi; versi dikenali dari
+# (path, ukuran, mtime) agar rerun widget tidak meng-hash seluruh file.
+# Baris yang ditambahkan lewat halaman ini hanya tersimpan di memori proses
+@st.cache_resource(max_entries=1)
+def load_cube(signature):
+    with REGISTRY.time('cube_build'):
+        return CohortCube.from_frame(load_dataset())
+
+cube = load_cube(file_signature(DATA_PATH))
+
+st.title("📊 Analitik Kohort")
+st.markdown(f"Agregat dropout/enrolled/graduate dari **{cube.rows}** mahasiswa, dihitung di muka per kombinasi dimensi.")
+
+group_by = st.multiselect(
+    "Kelompokkan Berdasarkan",
+    options=DIMENSIONS,
+    default=['Course'],
+    format_func=DIMENSION_LABELS.get
+)
+
+filters = {}
+with st.expander("🔎 Filter"):
+    for dim in DIMENSIONS:
+        values = cube.query([dim]).index.tolist()
+        selected = st.multiselect(DIMENSION_LABELS[dim], options=values, key=f"filter_{dim}")
+        if selected:
+            filters[dim] = selected
+
+with REGISTRY.time('cube_query'):
+    result, seconds = cube.timed_query(group_by, filters)
+
+st.caption(f"Kueri dijawab dalam {seconds * 1000:.2f} ms")
+st.dataframe(result.style.format({'dropout_rate': '{:.1%}'}))
+if group_by and len(result) > 1:
+    chart = result['dropout_rate']
+    if isinstance(chart.index, pd.MultiIndex):
+        chart.index = chart.index.map(lambda key: ' / '.join(map(str, key)))
+    st.bar_chart(chart)
+
+# Tambah baris baru ke cube tanpa membangun ulang
+st.markdown("---")
+st.subheader("➕ Tambah Data Mahasiswa")
+st.markdown("Unggah file CSV (separator `;`) dengan kolom dimensi di atas dan kolom `Status`.")
+new_rows = st.file_uploader("File CSV Mahasiswa Baru", type=["csv"])
+if new_rows is not None and st.button("Tambahkan ke Cube"):
+    try:
+        data = pd.read_csv(new_rows, sep=';', usecols=DIMENSIONS + ['Status'])
+        with REGISTRY.time('cube_append'):
+            cube.append(data)
+        REGISTRY.inc('cube_rows_appended_total', len(data))
+        st.success(f"{len(data)} baris ditambahkan; cube kini berisi {cube.rows} mahasiswa")
+    except Exception as e:
+        st.error("❌ Terjadi kesalahan dalam pemrosesan")
+        st.error(f"Detail error: {str(e)}")
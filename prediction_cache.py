@@ -0,0 +1,93 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from artifacts import COMPILED_MODEL_PATH, MODEL_PATH, SCALER_NPZ_PATH, SCALER_PATH, artifact_signature
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 3600
+# Pembulatan agar input yang hanya berbeda noise floating point berbagi satu entri
+KEY_DECIMALS = 6
+
+
+class PredictionCache:
+    """Cache LRU + TTL untuk hasil prediksi, dipakai bersama oleh semua sesi dalam satu proses.
+
+    Entri dikosongkan otomatis ketika file model atau scaler berubah di disk.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 watched_paths=(MODEL_PATH, SCALER_PATH, COMPILED_MODEL_PATH, SCALER_NPZ_PATH)):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.watched_paths = tuple(watched_paths)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._signature = artifact_signature(self.watched_paths)
+
+    @staticmethod
+    def make_key(vector, version=None):
+        """Key dari vektor fitur; `version` memisahkan entri antar versi model."""
+        normalized = np.round(np.asarray(vector, dtype=np.float64), KEY_DECIMALS) + 0.0
+        digest = hashlib.blake2b(np.ascontiguousarray(normalized).tobytes(), digest_size=16)
+        if version is not None:
+            digest.update(str(version).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _check_artifacts(self):
+        signature = artifact_signature(self.watched_paths)
+        if signature != self._signature:
+            self._signature = signature
+            self._entries.clear()
+            self.invalidations += 1
+
+    def get(self, key):
+        """Kembalikan dict {probability, prediction, contributions} atau None."""
+        with self._lock:
+            self._check_artifacts()
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, entry = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, probability, prediction, contributions=None):
+        with self._lock:
+            self._check_artifacts()
+            self._entries[key] = (
+                time.monotonic() + self.ttl_seconds,
+                {'probability': probability, 'prediction': prediction, 'contributions': contributions},
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
@@ -0,0 +1,57 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+from artifacts import BASE_DIR
+
+APP_PATH = os.path.join(BASE_DIR, 'app.py')
+
+
+def run(sessions=16, reruns=5, timeout=60):
+    """CPU proses (user+sys) per rerun app.py untuk `sessions` sesi yang berbagi satu proses server.
+
+    AppTest tidak thread-safe, jadi sesi dijalankan bergiliran (round-robin) di satu proses;
+    semua sesi tetap berbagi cache st.cache_resource seperti pada server Streamlit sungguhan.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    apps = [AppTest.from_file(APP_PATH, default_timeout=timeout) for _ in range(sessions)]
+    # Pemanasan: muat artefak, cache resource dan modul sebelum diukur
+    apps[0].run()
+
+    timings = {'initial': [], 'submit': []}
+    for at in apps[1:]:
+        start = time.process_time()
+        at.run()
+        timings['initial'].append(time.process_time() - start)
+    for i in range(reruns):
+        for at in apps:
+            next(n for n in at.number_input if n.label == "Nilai Masuk").set_value(float(90 + i))
+            next(b for b in at.button if 'Prediksi' in b.label).click()
+            start = time.process_time()
+            at.run()
+            timings['submit'].append(time.process_time() - start)
+            if at.exception:
+                raise RuntimeError(at.exception[0].value)
+
+    return {
+        'sessions': sessions,
+        'reruns': sum(len(v) for v in timings.values()),
+        **{f'{name}_cpu_ms_per_rerun': sum(v) / len(v) * 1000 for name, v in timings.items() if v},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ukur CPU server Streamlit per rerun app.py dengan banyak sesi.")
+    parser.add_argument('--sessions', type=int, default=16)
+    parser.add_argument('--reruns', type=int, default=5, help="Jumlah submit form per sesi")
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.sessions, args.reruns), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+import argparse
+import functools
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from batch_scoring import score_matrix
+from feature_pipeline import RAW_COLUMNS
+from metrics import REGISTRY
+from model_registry import DEFAULT_POLL_SECONDS, ModelRegistry, load_bundle
+from option_catalog import invalid_codes
+
+DEFAULT_MAX_WAIT_MS = 5.0
+DEFAULT_MAX_BATCH_SIZE = 256
+
+
+def records_to_matrix(records):
+    """Validasi record JSON dan ubah menjadi matriks float dengan urutan RAW_COLUMNS."""
+    if isinstance(records, dict):
+        records = [records]
+    if not isinstance(records, list) or not records:
+        raise ValueError("Body harus berupa satu record atau daftar record")
+
+    matrix = np.empty((len(records), len(RAW_COLUMNS)), dtype=np.float64)
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise ValueError(f"Record ke-{i} bukan objek JSON")
+        missing = [col for col in RAW_COLUMNS if col not in record]
+        if missing:
+            raise ValueError(f"Record ke-{i}: kolom tidak ditemukan: {', '.join(missing)}")
+        try:
+            matrix[i] = [float(record[col]) for col in RAW_COLUMNS]
+        except (TypeError, ValueError):
+            raise ValueError(f"Record ke-{i}: semua kolom harus bernilai numerik")
+        unknown = invalid_codes(record)
+        if unknown:
+            raise ValueError(f"Record ke-{i}: kode kategori tidak dikenal: {', '.join(unknown)}")
+    return matrix
+
+
+class MicroBatcher:
+    """Gabungkan permintaan yang datang berdekatan menjadi satu panggilan predict_proba.
+
+    Setiap batch memakai satu bundle dari registry, sehingga hot-swap model tidak
+    pernah mencampur dua versi dalam satu batch.
+    """
+
+    def __init__(self, registry, max_wait_ms=DEFAULT_MAX_WAIT_MS, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        self.registry = registry
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, matrix):
+        future = Future()
+        self._queue.put((matrix, future))
+        return future
+
+    def predict(self, records, timeout=None):
+        return self.submit(records_to_matrix(records)).result(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            self._score(batch)
+
+    def _score(self, batch):
+        bundle = self.registry.current()
+        try:
+            with REGISTRY.time('server_features'):
+                features = bundle.pipeline.transform(np.vstack([matrix for matrix, _ in batch]))
+                # Monitor dibuat registry saat bundle dimuat, jadi worker batch tidak pernah membangunnya
+                if bundle.drift_monitor is not None:
+                    bundle.drift_monitor.update(features)
+            with REGISTRY.time('server_predict'):
+                probability, prediction = score_matrix(features, bundle.predictor)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(features)
+        offset = 0
+        for matrix, future in batch:
+            end = offset + len(matrix)
+            future.set_result([
+                {'dropout_probability': float(p), 'prediction': int(label), 'model_version': bundle.version}
+                for p, label in zip(probability[offset:end], prediction[offset:end])
+            ])
+            offset = end
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Antrian listen bawaan (5) terlalu kecil untuk banyak klien bersamaan
+    request_queue_size = 1024
+
+
+def make_handler(batcher):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/metrics':
+                body = REGISTRY.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            if self.path == '/drift':
+                bundle = batcher.registry.current()
+                monitor = bundle.drift_monitor if bundle else None
+                self._send_json(200, monitor.snapshot() if monitor else {'count': 0, 'alerts': []})
+                return
+            if self.path != '/health':
+                self._send_json(404, {'error': 'Not found'})
+                return
+            bundle = batcher.registry.current()
+            self._send_json(200, {'status': 'ok', 'model_version': bundle.version if bundle else None,
+                                  'batches': batcher.batches, 'rows': batcher.rows})
+
+        def do_POST(self):
+            if self.path != '/predict':
+                self._send_json(404, {'error': 'Not found'})
+                return
+            REGISTRY.inc('server_requests_total')
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'null')
+                if isinstance(payload, dict) and 'records' in payload:
+                    payload = payload['records']
+                matrix = records_to_matrix(payload)
+            except ValueError as e:
+                REGISTRY.inc('server_errors_total', code='400')
+                self._send_json(400, {'error': str(e)})
+                return
+
+            try:
+                predictions = batcher.submit(matrix).result()
+            except Exception as e:
+                REGISTRY.inc('server_errors_total', code='500')
+                self._send_json(500, {'error': str(e)})
+                return
+            self._send_json(200, {'predictions': predictions})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScoringHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server HTTP lokal untuk skor dropout dengan micro-batching.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Waktu tunggu maksimum untuk mengumpulkan satu batch")
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help="Jumlah record maksimum per batch")
+    parser.add_argument('--poll-seconds', type=float, default=DEFAULT_POLL_SECONDS,
+                        help="Interval pemeriksaan artefak baru untuk hot-swap")
+    parser.add_argument('--compact-tolerance', type=float, default=None,
+                        help="Pakai varian ringkas (model_compaction.py) jika akurasinya turun paling banyak nilai ini")
+    args = parser.parse_args(argv)
+
+    loader = functools.partial(load_bundle, compact_tolerance=args.compact_tolerance)
+    registry = ModelRegistry(args.poll_seconds, loader=loader).start()
+    if registry.current() is None:
+        print("Model, scaler atau label encoder tidak dapat dimuat.", file=sys.stderr)
+        return 1
+
+    batcher = MicroBatcher(registry, args.max_wait_ms, args.max_batch_size)
+    server = ScoringServer((args.host, args.port), make_handler(batcher))
+    print(f"Server berjalan di http://{args.host}:{args.port} (POST /predict, GET /health, GET /metrics, GET /drift)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
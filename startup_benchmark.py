@@ -0,0 +1,79 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from artifacts import BASE_DIR
+
+# Setiap mode dijalankan di proses baru agar yang terukur benar-benar cold start
+SCENARIOS = {
+    # Jalur lama app.py: impor berat di level modul lalu unpickle tiga file joblib
+    'pickle': '''
+import joblib
+import pandas
+import plotly.graph_objects
+from artifacts import load_artifacts
+model, scaler, label_encoders = load_artifacts()
+assert model is not None
+''',
+    # Jalur baru: hanya NumPy + file .npz/.json hasil export_artifacts.py
+    'native': '''
+from artifacts import load_native_artifacts
+predictor, scaler, label_encoders = load_native_artifacts()
+assert predictor is not None
+''',
+}
+
+# VmHWM direset saat exec, berbeda dengan ru_maxrss yang mewarisi puncak proses induk
+REPORT = '''
+import json, resource, sys
+def max_rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({'max_rss_mb': max_rss_mb(),
+                  'heavy_modules': sorted(m for m in ('xgboost', 'sklearn', 'pandas', 'joblib', 'plotly')
+                                          if m in sys.modules)}))
+'''
+
+
+def measure(code):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code + REPORT], cwd=BASE_DIR,
+                            capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONPATH': BASE_DIR})
+    wall = time.perf_counter() - start
+    return {'wall_seconds': wall, **json.loads(result.stdout.strip().splitlines()[-1])}
+
+
+def run(repeat):
+    report = {}
+    for name, code in SCENARIOS.items():
+        runs = [measure(code) for _ in range(repeat)]
+        report[name] = {
+            'wall_seconds_median': statistics.median(r['wall_seconds'] for r in runs),
+            'max_rss_mb_median': statistics.median(r['max_rss_mb'] for r in runs),
+            'heavy_modules': runs[-1]['heavy_modules'],
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bandingkan waktu cold start dan RSS pemuatan artefak pickle vs native.")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(run(args.repeat), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import functools
+
+import pytest
+
+from artifacts import artifact_signature
+from model_registry import ModelBundle, ModelRegistry, validate_bundle
+
+
+def _bundle(version):
+    # Signature sama dengan file di disk agar reload() tidak menganggap artefak sedang ditulis
+    return ModelBundle(version, None, None, {'x': []}, None, 'native', artifact_signature())
+
+
+class FakeLoader:
+    def __init__(self, version):
+        self.version = version
+
+    def __call__(self):
+        return _bundle(self.version)
+
+
+def _reject_version(rejected, bundle):
+    if bundle.version == rejected:
+        raise ValueError("Akurasi sampel terlalu rendah")
+    return 0.9
+
+
+@pytest.fixture
+def loader():
+    return FakeLoader('v1')
+
+
+def test_reload_swaps_to_new_version(loader):
+    registry = ModelRegistry(loader=loader, validator=lambda bundle: 0.9)
+    assert registry.reload()
+    first = registry.current()
+
+    loader.version = 'v2'
+    assert registry.reload()
+    assert registry.current() is not first
+    assert registry.current().version == 'v2'
+    assert [entry['status'] for entry in registry.history] == ['aktif', 'aktif']
+
+
+def test_reload_rejects_invalid_bundle_and_keeps_current(loader):
+    registry = ModelRegistry(loader=loader, validator=functools.partial(_reject_version, 'v2'))
+    registry.reload()
+
+    loader.version = 'v2'
+    assert not registry.reload()
+    assert registry.current().version == 'v1'
+    assert registry.history[-1]['status'] == 'ditolak'
+    assert registry._rejected_signature == artifact_signature()
+
+
+def test_reload_same_version_keeps_bundle(loader):
+    registry = ModelRegistry(loader=loader, validator=lambda bundle: 0.9)
+    registry.reload()
+    first = registry.current()
+    first.signature = None
+
+    assert not registry.reload()
+    assert registry.current() is first
+    assert first.signature == artifact_signature()
+    assert len(registry.history) == 1
+
+
+def test_reload_without_validation_sample_serves_initial_bundle_only(loader, tmp_path):
+    validator = functools.partial(validate_bundle, path=str(tmp_path / 'data.csv'))
+    registry = ModelRegistry(loader=loader, validator=validator)
+
+    assert registry.reload()
+    assert registry.current().version == 'v1'
+    assert registry.history[-1]['status'] == 'tidak divalidasi'
+
+    loader.version = 'v2'
+    assert not registry.reload()
+    assert registry.current().version == 'v1'
+    assert registry.history[-1]['status'] == 'ditolak'
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from artifacts import COMPILED_MODEL_PATH, DATA_PATH, load_artifacts, load_feature_pipeline
+from cohort_cube import CohortCube
+from compiled_predictor import CompiledPredictor
+from incremental_train import rescale_booster, update_scaler
+
+# Selisih probabilitas maksimum terhadap XGBoost (akumulasi float32 vs float64 atas 100 pohon)
+PROBABILITY_TOLERANCE = 1e-6
+# Selisih kontribusi/bias (log-odds) terhadap pred_contribs + approx_contribs XGBoost
+CONTRIBUTION_TOLERANCE = 1e-6
+
+
+@pytest.fixture(scope='module')
+def artifacts():
+    model, scaler, _ = load_artifacts()
+    if model is None:
+        pytest.skip("Artefak pickle tidak tersedia")
+    return model, scaler
+
+
+@pytest.fixture(scope='module')
+def data():
+    return pd.read_csv(DATA_PATH, sep=';')
+
+
+@pytest.fixture(scope='module')
+def features(data):
+    return load_feature_pipeline().transform(data.drop(columns=['Status']))
+
+
+def _scaled(scaler, X):
+    return scaler.transform(pd.DataFrame(X, columns=scaler.feature_names_in_))
+
+
+def test_compiled_predictor_matches_xgboost(artifacts, features):
+    model, scaler = artifacts
+    predictor = CompiledPredictor.from_model(model, scaler)
+
+    expected = model.predict_proba(_scaled(scaler, features))[:, 1]
+    probability = predictor.predict_proba(features)
+
+    assert np.max(np.abs(probability - expected)) < PROBABILITY_TOLERANCE
+    np.testing.assert_array_equal(probability > 0.5, expected > 0.5)
+
+
+def test_compiled_predictor_single_row_and_saved_file(artifacts, features):
+    model, scaler = artifacts
+    predictor = CompiledPredictor.from_model(model, scaler)
+    batch = predictor.predict_proba(features[:200])
+
+    for x, p in zip(features[:200], batch):
+        label, probability = predictor.predict_one(x)
+        assert probability == pytest.approx(p, abs=1e-12)
+        assert label == int(p > 0.5)
+
+    saved = CompiledPredictor.load(COMPILED_MODEL_PATH)
+    np.testing.assert_allclose(saved.predict_proba(features), predictor.predict_proba(features), rtol=0, atol=1e-12)
+
+
+def test_compiled_contributions_match_xgboost_approx(artifacts, features):
+    model, scaler = artifacts
+    predictor = CompiledPredictor.from_model(model, scaler)
+    rows = features[:500]
+
+    expected = model.get_booster().predict(xgb.DMatrix(_scaled(scaler, rows)), pred_contribs=True,
+                                           approx_contribs=True)
+    contribs, bias = predictor.contributions(rows)
+
+    np.testing.assert_allclose(contribs, expected[:, :-1], rtol=0, atol=CONTRIBUTION_TOLERANCE)
+    np.testing.assert_allclose(bias, expected[:, -1], rtol=0, atol=CONTRIBUTION_TOLERANCE)
+    # Kontribusi + bias = margin prediksi yang sama dengan predict_proba
+    margin = contribs.sum(axis=1) + bias
+    np.testing.assert_allclose(1.0 / (1.0 + np.exp(-margin)), predictor.predict_proba(rows), rtol=0, atol=1e-12)
+
+
+def test_rescale_booster_keeps_predictions(artifacts, features):
+    model, scaler = artifacts
+    booster = model.get_booster()
+    # Scaler bergeser setelah partial_fit dengan baris yang distribusinya berbeda
+    new_scaler = update_scaler(scaler, features[:500] * 1.5 + 1.0)
+    rescaled = rescale_booster(booster, scaler, new_scaler)
+
+    expected = booster.predict(xgb.DMatrix(_scaled(scaler, features)))
+    probability = rescaled.predict(xgb.DMatrix(_scaled(new_scaler, features)))
+    np.testing.assert_array_equal(probability, expected)
+
+
+def test_cohort_cube_append_matches_rebuild(data):
+    full = CohortCube.from_frame(data)
+    incremental = CohortCube.from_frame(data.iloc[:3000]).append(data.iloc[3000:4000]).append(data.iloc[4000:])
+
+    assert incremental.rows == full.rows
+    assert set(incremental.cuboids) == set(full.cuboids)
+    for dims, cells in full.cuboids.items():
+        pd.testing.assert_frame_equal(incremental.cuboids[dims].sort_index(), cells.sort_index(), check_names=False)
+
+    query = (['Course', 'Gender'], {'Debtor': [1]})
+    pd.testing.assert_frame_equal(incremental.query(*query), full.query(*query))
@@ -0,0 +1,213 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from artifacts import BASE_DIR, DATA_PATH
+from drift_monitor import code_histograms, save_reference_histograms
+from feature_pipeline import CODE_COLUMNS, FeaturePipeline
+from training_utils import RANDOM_STATE, holdout_split
+
+# Ruang pencarian yang sama dengan GridSearchCV di notebook; n_estimators menjadi
+# batas atas ronde boosting yang dipotong oleh early stopping
+PARAM_GRID = {
+    'max_depth': [3, 5, 7],
+    'learning_rate': [0.01, 0.1, 0.2],
+    'subsample': [0.8, 1],
+    'colsample_bytree': [0.8, 1],
+}
+MAX_ROUNDS = 200
+CV_FOLDS = 3
+
+# Successive halving: anggaran ronde per tahap, sepertiga kandidat terbaik lanjut ke tahap berikutnya
+RUNG_ROUNDS = [25, 75, MAX_ROUNDS]
+REDUCTION_FACTOR = 3
+EARLY_STOPPING_ROUNDS = 20
+# Porsi bagian latih tiap fold yang dipakai untuk early stopping; fold validasi hanya untuk skor
+EARLY_STOPPING_FRACTION = 0.15
+
+# Matriks per fold di setiap worker; dibangun sekali lalu dipakai ulang untuk semua kandidat
+_FOLDS = None
+
+
+def load_training_data(path=DATA_PATH):
+    data = pd.read_csv(path, sep=';')
+    y = (data['Status'] == 'Dropout').astype(int).to_numpy()
+    data = data.drop(columns=['Status'])
+    pipeline = FeaturePipeline.fit(data)
+    X = pipeline.transform(data)
+    return X, y, pipeline, data
+
+
+def build_label_encoders(data, pipeline):
+    """LabelEncoder per kolom kode kategori dan kategori teks pipeline (format label_encoders.pkl)."""
+    # Model memakai kode apa adanya; encoder hanya dipertahankan untuk kompatibilitas aplikasi
+    label_encoders = {}
+    for col in CODE_COLUMNS:
+        le = LabelEncoder()
+        le.fit(data[col].astype(str))
+        label_encoders[col] = le
+    for col, classes in pipeline.categories.items():
+        le = LabelEncoder()
+        le.classes_ = np.array(classes, dtype=object)
+        label_encoders[col] = le
+    return label_encoders
+
+
+def _init_worker(X, y, folds, max_bin):
+    global _FOLDS
+    # Potongan kuantil dihitung sekali dari seluruh data latih dan dipakai ulang oleh semua fold
+    reference = xgb.QuantileDMatrix(X, y, max_bin=max_bin)
+    _FOLDS = []
+    for train_idx, valid_idx in folds:
+        fit_idx, stop_idx = train_test_split(train_idx, test_size=EARLY_STOPPING_FRACTION,
+                                             random_state=RANDOM_STATE, stratify=y[train_idx])
+        _FOLDS.append((
+            xgb.QuantileDMatrix(X[fit_idx], y[fit_idx], ref=reference, max_bin=max_bin),
+            xgb.DMatrix(X[stop_idx], y[stop_idx]),
+            xgb.DMatrix(X[valid_idx]),
+            y[valid_idx],
+        ))
+
+
+def _evaluate(candidate, num_rounds):
+    """Skor CV (akurasi, seperti GridSearchCV) satu kandidat dengan anggaran num_rounds ronde.
+
+    Early stopping memakai potongan dari bagian latih fold, sehingga fold validasi yang diskor
+    tidak ikut menentukan jumlah ronde dan skornya sebanding dengan best_score_ GridSearchCV.
+    """
+    params = {
+        'objective': 'binary:logistic',
+        'eval_metric': 'logloss',
+        'tree_method': 'hist',
+        'nthread': 1,
+        'seed': RANDOM_STATE,
+        **candidate,
+    }
+    scores, best_rounds = [], []
+    for dtrain, dstop, dvalid, y_valid in _FOLDS:
+        booster = xgb.train(params, dtrain, num_rounds, evals=[(dstop, 'stop')],
+                            early_stopping_rounds=EARLY_STOPPING_ROUNDS, verbose_eval=False)
+        best = booster.best_iteration + 1
+        probability = booster.predict(dvalid, iteration_range=(0, best))
+        scores.append(accuracy_score(y_valid, probability > 0.5))
+        best_rounds.append(best)
+    return float(np.mean(scores)), int(round(np.mean(best_rounds)))
+
+
+def successive_halving(X, y, n_workers=None, max_bin=256):
+    """Cari hyperparameter dengan successive halving; kembalikan (params terbaik, skor, ronde, riwayat)."""
+    keys = list(PARAM_GRID)
+    candidates = [dict(zip(keys, values)) for values in itertools.product(*PARAM_GRID.values())]
+    folds = list(StratifiedKFold(n_splits=CV_FOLDS).split(X, y))
+    history = []
+
+    with ProcessPoolExecutor(max_workers=n_workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(X, y, folds, max_bin)) as executor:
+        for i, num_rounds in enumerate(RUNG_ROUNDS):
+            results = list(executor.map(_evaluate, candidates, itertools.repeat(num_rounds)))
+            ranked = sorted(zip(candidates, results), key=lambda item: item[1][0], reverse=True)
+            history.append({'rounds': num_rounds, 'candidates': len(candidates),
+                            'best_score': ranked[0][1][0]})
+            if i < len(RUNG_ROUNDS) - 1:
+                candidates = [c for c, _ in ranked[:max(1, len(ranked) // REDUCTION_FACTOR)]]
+
+    best_params, (best_score, best_rounds) = ranked[0]
+    return best_params, best_score, best_rounds, history
+
+
+def grid_search_baseline(X, y):
+    """GridSearchCV lama dari notebook (72 konfigurasi x 3 fold), untuk pembanding."""
+    from sklearn.model_selection import GridSearchCV
+
+    model = xgb.XGBClassifier(objective='binary:logistic', eval_metric='logloss', random_state=RANDOM_STATE)
+    grid_search = GridSearchCV(
+        estimator=model,
+        param_grid={**PARAM_GRID, 'n_estimators': [100, 200]},
+        cv=CV_FOLDS,
+        n_jobs=-1,
+    )
+    start = time.perf_counter()
+    grid_search.fit(X, y)
+    return {
+        'seconds': time.perf_counter() - start,
+        'best_cv_score': float(grid_search.best_score_),
+        'best_params': grid_search.best_params_,
+    }
+
+
+def train(output_dir=BASE_DIR, compare_grid=False, n_workers=None):
+    X, y, pipeline, data = load_training_data()
+
+    # Normalisasi fitur (dengan nama kolom agar scaler.feature_names_in_ terisi)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(pd.DataFrame(X, columns=pipeline.feature_names))
+    X_train, X_test, y_train, y_test = holdout_split(X_scaled, y)
+
+    start = time.perf_counter()
+    best_params, best_score, best_rounds, history = successive_halving(X_train, y_train, n_workers)
+    search_seconds = time.perf_counter() - start
+
+    best_model = xgb.XGBClassifier(
+        objective='binary:logistic',
+        eval_metric='logloss',
+        tree_method='hist',
+        random_state=RANDOM_STATE,
+        n_estimators=best_rounds,
+        **best_params,
+    )
+    best_model.fit(X_train, y_train)
+    test_accuracy = accuracy_score(y_test, best_model.predict(X_test))
+
+    label_encoders = build_label_encoders(data, pipeline)
+
+    os.makedirs(output_dir, exist_ok=True)
+    joblib.dump(best_model, os.path.join(output_dir, 'model_dropout_xgboost.pkl'))
+    joblib.dump(scaler, os.path.join(output_dir, 'scaler.pkl'))
+    joblib.dump(label_encoders, os.path.join(output_dir, 'label_encoders.pkl'))
+    pipeline.save(os.path.join(output_dir, 'feature_pipeline.json'))
+    # Referensi drift dari baris yang sama dengan scaler, agar monitor tidak perlu membaca data.csv
+    save_reference_histograms(code_histograms(X, pipeline.feature_names),
+                              os.path.join(output_dir, 'drift_reference.json'))
+
+    report = {
+        'successive_halving': {
+            'seconds': search_seconds,
+            'best_cv_score': best_score,
+            'best_params': {**best_params, 'n_estimators': best_rounds},
+            'rungs': history,
+        },
+        'test_accuracy': test_accuracy,
+    }
+    if compare_grid:
+        report['grid_search'] = grid_search_baseline(X_train, y_train)
+        report['speedup'] = report['grid_search']['seconds'] / search_seconds
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latih ulang model dropout dengan successive halving + early stopping.")
+    parser.add_argument('--output-dir', default=BASE_DIR, help="Direktori tujuan artefak model")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (bawaan: jumlah CPU)")
+    parser.add_argument('--compare-grid', action='store_true',
+                        help="Jalankan juga GridSearchCV lama untuk membandingkan waktu dan skor CV")
+    args = parser.parse_args(argv)
+
+    report = train(args.output_dir, args.compare_grid, args.workers)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,28 @@
+import numpy as np
+from sklearn.metrics import accuracy_score, log_loss, roc_auc_score
+from sklearn.model_selection import train_test_split
+
+RANDOM_STATE = 42
+# Porsi hold-out; semua perbandingan akurasi/AUC antar model bergantung pada pembagian yang sama
+TEST_SIZE = 0.2
+
+
+def holdout_split(X, y):
+    """(X_train, X_test, y_train, y_test) terstratifikasi yang dipakai train.py dan model_compaction.py."""
+    return train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE, stratify=y)
+
+
+def booster_params(model):
+    """Parameter xgb.train dari XGBClassifier terlatih, untuk melanjutkan atau melatih ulang booster-nya."""
+    params = {k: v for k, v in model.get_xgb_params().items() if v is not None and k != 'use_label_encoder'}
+    params['seed'] = params.pop('random_state', RANDOM_STATE)
+    return params
+
+
+def holdout_metrics(probability, y):
+    """Akurasi, AUC (None jika y hanya satu kelas) dan logloss dari probabilitas dropout."""
+    return {
+        'accuracy': float(accuracy_score(y, probability > 0.5)),
+        'auc': float(roc_auc_score(y, probability)) if len(np.unique(y)) > 1 else None,
+        'logloss': float(log_loss(y, probability, labels=[0, 1])),
+    }
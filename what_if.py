@@ -0,0 +1,55 @@
+import numpy as np
+
+from feature_pipeline import RAW_COLUMNS
+
+# Kolom dengan nilai unik sebanyak ini atau kurang disapu per nilai yang ada (kode kategori, 0/1)
+MAX_LEVELS = 50
+MAX_STEPS = 100
+
+
+def feature_domains(data, columns=RAW_COLUMNS):
+    """Rentang valid tiap fitur dari data historis: nilai unik untuk kode, min/max untuk nilai kontinu."""
+    domains = {}
+    for col in columns:
+        values = np.asarray(data[col])
+        unique = np.unique(values[~np.isnan(values)] if values.dtype.kind == 'f' else values)
+        integer = values.dtype.kind in 'iu' or bool(np.all(unique == np.round(unique)))
+        domains[col] = {
+            'min': float(unique[0]),
+            'max': float(unique[-1]),
+            'integer': integer,
+            'levels': unique.astype(np.float64).tolist() if len(unique) <= MAX_LEVELS else None,
+        }
+    return domains
+
+
+def sweep_values(domain, steps=MAX_STEPS):
+    """Titik sapuan untuk satu fitur, paling banyak `steps` nilai."""
+    if domain['levels'] is not None:
+        levels = np.array(domain['levels'])
+        if len(levels) <= steps:
+            return levels
+        # Kode kategori tidak boleh diinterpolasi: ambil entri berjarak rata dari daftar level
+        return levels[np.unique(np.linspace(0, len(levels) - 1, steps).round().astype(int))]
+    values = np.linspace(domain['min'], domain['max'], steps)
+    return np.unique(np.round(values)) if domain['integer'] else values
+
+
+def sweep(predictor, pipeline, record, columns, values):
+    """Risiko dropout untuk semua kombinasi `values` pada `columns`, fitur lain tetap dari `record`.
+
+    Seluruh varian dibangun sebagai satu matriks dan dinilai dengan satu panggilan
+    predict_proba; hasil berbentuk (len(values[0]), len(values[1]), ...).
+    """
+    if len(columns) != len(values):
+        raise ValueError("Jumlah kolom dan daftar nilai sapuan harus sama")
+    unknown = [col for col in columns if col not in RAW_COLUMNS]
+    if unknown:
+        raise ValueError(f"Kolom tidak dikenal: {', '.join(unknown)}")
+
+    base = np.fromiter((record[col] for col in RAW_COLUMNS), dtype=np.float64, count=len(RAW_COLUMNS))
+    grids = np.meshgrid(*[np.asarray(v, dtype=np.float64) for v in values], indexing='ij')
+    raw = np.tile(base, (grids[0].size, 1))
+    for col, grid in zip(columns, grids):
+        raw[:, RAW_COLUMNS.index(col)] = grid.ravel()
+    return predictor.predict_proba(pipeline.transform(raw)).reshape(grids[0].shape)